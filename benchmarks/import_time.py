@@ -0,0 +1,88 @@
+"""
+Время холодного импорта pyozonapi.
+
+Запуск:
+
+    python -m benchmarks.import_time --repeat 15
+
+Каждый сценарий выполняется в новом процессе интерпретатора, выводится медиана. Для сравнения с другой версией
+библиотеки укажите путь к ее копии: ``--path /tmp/pyozonapi-old`` (например, из ``git worktree add``).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import (
+    Dict,
+    List,
+    Optional
+)
+
+SCENARIOS: Dict[str, str] = {
+    "package": "import pyozonapi",
+    "client": "from pyozonapi.client import OzonClient",
+    "stocks_update": (
+        "from pyozonapi.client import OzonClient\n"
+        "from pyozonapi.models.stocks import StocksUpdateParams\n"
+        "OzonClient('key', 'id').stocks"
+    ),
+    "push": "from pyozonapi.push import OzonPushClient",
+    "everything": (
+        "from pyozonapi.client import OzonClient\n"
+        "from pyozonapi.push import OzonPushClient\n"
+        "from pyozonapi.manager import OzonClientManager\n"
+        "from pyozonapi.store import PostingStore\n"
+        "client = OzonClient('key', 'id')\n"
+        "client.stocks, client.product, client.posting, client.sync"
+    ),
+}
+
+TEMPLATE = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "{statement}\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+def measure(statement: str, repeat: int, path: Optional[str] = None) -> Optional[List[float]]:
+    """
+    Выполняет statement в repeat новых процессах и возвращает время в секундах.
+    Если statement завершился ошибкой (например, в старой версии нет модуля), возвращает None.
+    """
+    env = dict(os.environ)
+    if path is not None:
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (path, env.get("PYTHONPATH"))))
+
+    timings = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", TEMPLATE.format(statement=statement)],
+            env=env, cwd=path, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="pyozonapi cold import time")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--path", help="directory with the pyozonapi package to measure")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [name for name in value.split(",") if name])
+    options = parser.parse_args(argv)
+
+    print(f"{'scenario':<16}{'median, ms':>12}{'min, ms':>10}")
+    for name in options.scenarios:
+        timings = measure(SCENARIOS[name], options.repeat, options.path)
+        if timings is None:
+            print(f"{name:<16}{'-':>12}{'-':>10}")
+            continue
+        print(f"{name:<16}{statistics.median(timings) * 1000:>12.1f}{min(timings) * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
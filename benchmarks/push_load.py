@@ -0,0 +1,93 @@
+import asyncio
+import multiprocessing
+from time import perf_counter
+from typing import (
+    Any,
+    Dict,
+    List
+)
+
+from aiohttp import ClientSession, TCPConnector
+
+
+def make_events(count: int, warehouses: int = 3) -> List[Dict[str, Any]]:
+    """
+    Возвращает набор push-уведомлений: новые отправления, смены статуса, отмены и проверки доступности.
+    """
+    events = []
+    for index in range(count):
+        posting_number = f"0{index:07d}-0001-1"
+        kind = index % 10
+
+        if kind == 0:
+            events.append({"message_type": "TYPE_PING", "time": "2026-10-18T10:00:00Z"})
+        elif kind < 5:
+            events.append({
+                "message_type": "TYPE_NEW_POSTING",
+                "seller_id": 1,
+                "warehouse_id": 1 + index % warehouses,
+                "posting_number": posting_number,
+                "in_process_at": "2026-10-18T10:00:00Z",
+                "products": [{"sku": 500000 + index, "quantity": 1}]
+            })
+        elif kind < 9:
+            events.append({
+                "message_type": "TYPE_STATE_CHANGED",
+                "seller_id": 1,
+                "warehouse_id": 1 + index % warehouses,
+                "posting_number": posting_number,
+                "new_state": "posting_transferring_to_delivery",
+                "changed_state_date": "2026-10-18T11:00:00Z"
+            })
+        else:
+            events.append({
+                "message_type": "TYPE_POSTING_CANCELLED",
+                "seller_id": 1,
+                "warehouse_id": 1 + index % warehouses,
+                "posting_number": posting_number,
+                "products": [{"sku": 500000 + index, "quantity": 1}],
+                "old_state": "posting_created",
+                "new_state": "posting_canceled",
+                "changed_state_date": "2026-10-18T11:00:00Z",
+                "reason": {"id": 352, "message": "Отмена покупателем"}
+            })
+    return events
+
+
+async def send_events(url: str, events: List[Dict[str, Any]], concurrency: int = 50) -> Dict[str, Any]:
+    """
+    Отправляет уведомления на url, не более concurrency одновременно.
+
+    :return: Время отправки и количество ответов по статусам.
+    """
+    statuses: Dict[int, int] = {}
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    for event in events:
+        queue.put_nowait(event)
+
+    async with ClientSession(connector=TCPConnector(limit=concurrency)) as session:
+
+        async def worker():
+            while not queue.empty():
+                event = queue.get_nowait()
+                async with session.post(url, json=event) as response:
+                    await response.read()
+                    statuses[response.status] = statuses.get(response.status, 0) + 1
+
+        started = perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return {"wall": perf_counter() - started, "statuses": statuses}
+
+
+def _run(url: str, count: int, concurrency: int, result: "multiprocessing.queues.Queue"):
+    result.put(asyncio.run(send_events(url, make_events(count), concurrency)))
+
+
+def start_in_process(url: str, count: int, concurrency: int = 50) -> "multiprocessing.queues.Queue":
+    """
+    Запускает генератор нагрузки в отдельном процессе. Результат send_events появится в возвращаемой очереди.
+    """
+    result: "multiprocessing.queues.Queue" = multiprocessing.Queue()
+    multiprocessing.Process(target=_run, args=(url, count, concurrency, result), daemon=True).start()
+    return result
@@ -0,0 +1,263 @@
+"""
+Бенчмарки pyozonapi на локальной замене OZON Seller API.
+
+Запуск:
+
+    python -m benchmarks.run --products 20000 --latency 0.01 --throttle-every 200 --memory
+
+Для каждого сценария выводятся время, запросы в секунду, процессорное время клиента
+и пиковая память (с флагом --memory, через tracemalloc). Сервер и генератор push-нагрузки
+работают в отдельных процессах и в замеры не попадают.
+"""
+import argparse
+import asyncio
+import json
+import tracemalloc
+from datetime import datetime
+from time import perf_counter, process_time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional
+)
+
+from aiohttp import ClientSession
+
+from pyozonapi.client import OzonClient
+from pyozonapi.push import OzonPushClient
+from pyozonapi.limiter import ENDPOINT_RATE_LIMITS, RateLimiter
+from pyozonapi.models.stocks import StocksUpdateParams
+
+from . import push_load, server
+
+SCENARIOS = (
+    "product_list",
+    "product_info",
+    "stocks",
+    "stocks_fbs",
+    "stocks_analytics",
+    "stocks_update",
+    "unfulfilled",
+    "unfulfilled_parallel",
+    "sync_serial",
+    "sync_pipeline",
+    "push",
+)
+
+
+class Context:
+    """
+    Общие данные сценариев: клиент и ответы, которые нужны как входные параметры.
+    """
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.base_url = f"http://127.0.0.1:{options.port}/"
+        self.client = OzonClient("benchmark", "benchmark", base_url=self.base_url, model_mode=options.model_mode,
+                                 chunk_concurrency=options.concurrency)
+        rate_limit = (options.rps, 1)
+        self.client.limiter = RateLimiter(
+            {endpoint: rate_limit for endpoint in ENDPOINT_RATE_LIMITS},
+            default_rate_limit=rate_limit,
+            max_concurrency=options.concurrency
+        )
+        self.product_list = None
+        self.product_info = None
+
+    async def server_requests(self) -> int:
+        async with ClientSession() as session:
+            async with session.get(f"{self.base_url}_stats") as response:
+                return (await response.json())["total"]
+
+
+async def product_list(ctx: Context) -> int:
+    return len((await ctx.client.product.get_list()).offers)
+
+
+async def product_info(ctx: Context) -> int:
+    return len((await ctx.client.product.get_info(ctx.product_list)).offers)
+
+
+async def stocks(ctx: Context) -> int:
+    return len((await ctx.client.stocks.get()).offers)
+
+
+async def stocks_fbs(ctx: Context) -> int:
+    return len((await ctx.client.stocks.get_fbs(ctx.product_info)).offers)
+
+
+async def stocks_analytics(ctx: Context) -> int:
+    response = await ctx.client.stocks.get_fbs(ctx.product_info)
+    response.warehouse_totals()
+    response.low_stock(ctx.options.low_stock)
+    return len(response.offers)
+
+
+async def stocks_update(ctx: Context) -> int:
+    params = [
+        StocksUpdateParams(offer_id=offer.id, product_id=offer.product_id, stock=index % 10, warehouse_id=1)
+        for index, offer in enumerate(ctx.product_list.offers)
+    ]
+    return len((await ctx.client.stocks.update(params)).offers)
+
+
+async def unfulfilled(ctx: Context) -> int:
+    response = await ctx.client.posting.get_unfulfilled_list(
+        "awaiting_packaging", datetime(2026, 1, 1), datetime(2027, 1, 1)
+    )
+    return len(response.orders)
+
+
+async def unfulfilled_parallel(ctx: Context) -> int:
+    response = await ctx.client.posting.get_unfulfilled_list(
+        "awaiting_packaging", datetime(2026, 1, 1), datetime(2027, 1, 1), parallel=True, shards=ctx.options.shards
+    )
+    return len(response.orders)
+
+
+async def sync_serial(ctx: Context) -> int:
+    products = await ctx.client.product.get_list()
+    info = await ctx.client.product.get_info(products)
+    return len((await ctx.client.stocks.get_fbs(info)).offers)
+
+
+async def sync_pipeline(ctx: Context) -> int:
+    return len((await ctx.client.sync.stocks_fbs()).stocks.offers)
+
+
+async def measure(name: str, run: Callable[[], Awaitable[int]], requests: Callable[[], Awaitable[int]],
+                  memory: bool) -> Dict[str, Any]:
+    before = await requests()
+
+    if memory:
+        tracemalloc.start()
+
+    wall, cpu = perf_counter(), process_time()
+    items = await run()
+    wall, cpu = perf_counter() - wall, process_time() - cpu
+
+    peak: Optional[int] = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    count = await requests() - before
+
+    return {
+        "scenario": name,
+        "items": items,
+        "requests": count,
+        "wall": wall,
+        "rps": count / wall if wall else 0.0,
+        "cpu": cpu,
+        "peak_memory": peak,
+    }
+
+
+async def push(ctx: Context) -> Dict[str, Any]:
+    options = ctx.options
+    client = OzonPushClient(host="127.0.0.1", port=options.push_port, workers=options.push_workers,
+                            processes=options.push_processes)
+    answered = {"requests": 0}
+
+    @client.on_event
+    async def on_event(event):
+        pass
+
+    await client.start()
+    try:
+        async def requests() -> int:
+            return answered["requests"]
+
+        async def run() -> int:
+            result = push_load.start_in_process(
+                f"http://127.0.0.1:{options.push_port}{client.webhook_path}", options.push_events, options.push_concurrency
+            )
+            statuses = (await asyncio.get_running_loop().run_in_executor(None, result.get))["statuses"]
+            answered["requests"] += sum(statuses.values())
+            return statuses.get(200, 0)
+
+        return await measure("push", run, requests, options.memory)
+    finally:
+        await client.stop()
+
+
+async def main(options: argparse.Namespace) -> List[Dict[str, Any]]:
+    process = server.start_in_process(
+        port=options.port,
+        products=options.products,
+        postings=options.postings,
+        latency=options.latency,
+        throttle_every=options.throttle_every
+    )
+    ctx = Context(options)
+    results = []
+
+    try:
+        async with ctx.client:
+            ctx.product_list = await ctx.client.product.get_list()
+            ctx.product_info = await ctx.client.product.get_info(ctx.product_list)
+
+            for name in options.scenarios:
+                if name == "push":
+                    results.append(await push(ctx))
+                    continue
+                scenario = globals()[name]
+                results.append(await measure(name, lambda: scenario(ctx), ctx.server_requests, options.memory))
+    finally:
+        process.terminate()
+
+    return results
+
+
+def report(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'scenario':<22}{'items':>9}{'requests':>10}{'wall, s':>10}{'req/s':>10}{'cpu, s':>9}{'peak, MiB':>11}"]
+    for result in results:
+        peak = f"{result['peak_memory'] / 2 ** 20:.1f}" if result["peak_memory"] is not None else "-"
+        lines.append(
+            f"{result['scenario']:<22}{result['items']:>9}{result['requests']:>10}{result['wall']:>10.3f}"
+            f"{result['rps']:>10.1f}{result['cpu']:>9.3f}{peak:>11}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="pyozonapi benchmarks against a local mock Ozon Seller API")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        type=lambda value: [name for name in value.split(",") if name])
+    parser.add_argument("--products", type=int, default=10000)
+    parser.add_argument("--postings", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency per request, seconds")
+    parser.add_argument("--throttle-every", type=int, default=0, help="answer every N-th request with 999")
+    parser.add_argument("--rps", type=int, default=1000, help="client rate limit per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="client chunk concurrency")
+    parser.add_argument("--shards", type=int, default=4, help="cutoff window shards for unfulfilled_parallel")
+    parser.add_argument("--model-mode", default="bulk", choices=("validate", "bulk", "lazy", "compact"))
+    parser.add_argument("--low-stock", type=int, default=2, help="available stock threshold for stocks_analytics")
+    parser.add_argument("--push-events", type=int, default=5000)
+    parser.add_argument("--push-concurrency", type=int, default=50)
+    parser.add_argument("--push-workers", type=int, default=0)
+    parser.add_argument("--push-processes", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--push-port", type=int, default=8766)
+    parser.add_argument("--memory", action="store_true", help="trace peak memory with tracemalloc")
+    parser.add_argument("--json", help="write results to this file")
+    options = parser.parse_args(argv)
+
+    unknown = set(options.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    return options
+
+
+if __name__ == "__main__":
+    options = parse_args()
+    results = asyncio.run(main(options))
+    print(report(results))
+
+    if options.json:
+        with open(options.json, "w") as file:
+            json.dump(results, file, indent=2)
@@ -0,0 +1,262 @@
+import asyncio
+import math
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional
+)
+
+from aiohttp import web
+
+# Время сборки отправления с номером index: SHIPMENT_START + index * SHIPMENT_STEP.
+SHIPMENT_START = datetime(2026, 10, 18, tzinfo=timezone.utc)
+SHIPMENT_STEP = timedelta(minutes=1)
+
+
+class MockOzonServer:
+    """
+    Локальная замена OZON Seller API для бенчмарков.
+
+    Отдает методы v2/product/list, v2/product/info/list, v3/product/info/stocks,
+    v1/product/info/stocks-by-warehouse/fbs, v2/products/stocks и v3/posting/fbs/unfulfilled/list
+    с пагинацией как у API, искусственной задержкой и ответами 999 о превышении лимита.
+
+    :param host: str - Хост сервера.
+    :param port: int - Порт сервера.
+    :param products: int - Количество товаров в каталоге.
+    :param postings: int - Количество необработанных отправлений.
+    :param warehouses: int - Количество складов FBS.
+    :param latency: float - Задержка каждого ответа в секундах.
+    :param throttle_every: int - Каждый N-й запрос получает ответ 999. Если 0 - без ограничений.
+    :param retry_after: float - Значение заголовка Retry-After в ответе 999.
+    """
+    def __init__(
+            self,
+            host: str = "127.0.0.1",
+            port: int = 8765,
+            products: int = 10000,
+            postings: int = 5000,
+            warehouses: int = 3,
+            latency: float = 0.0,
+            throttle_every: int = 0,
+            retry_after: float = 0.05
+    ):
+        self.host: str = host
+        self.port: int = port
+        self.products: int = products
+        self.postings: int = postings
+        self.warehouses: int = warehouses
+        self.latency: float = latency
+        self.throttle_every: int = throttle_every
+        self.retry_after: float = retry_after
+        self.requests: Dict[str, int] = {}
+        self.throttled: int = 0
+        self._total: int = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def _product(self, index: int) -> Dict[str, Any]:
+        return {
+            "offer_id": f"offer-{index}",
+            "product_id": 100000 + index,
+            "sku": 500000 + index,
+            "name": f"Товар {index}",
+            "barcode": f"46000000{index:05d}",
+            "is_archived": False,
+            "visible": True,
+            "price": "1990.00",
+            "stocks": {"coming": 0, "present": index % 17, "reserved": index % 3},
+            "discounted_stocks": {"coming": 0, "present": 0, "reserved": 0},
+            "visibility_details": {
+                "active_product": True,
+                "has_price": True,
+                "has_stock": bool(index % 17),
+                "reasons": {}
+            },
+        }
+
+    def _posting(self, index: int) -> Dict[str, Any]:
+        return {
+            "posting_number": f"0{index:07d}-0001-1",
+            "order_id": 700000 + index,
+            "order_number": f"0{index:07d}-0001",
+            "status": "awaiting_packaging",
+            "substatus": "posting_created",
+            "shipment_date": (SHIPMENT_START + SHIPMENT_STEP * index).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "in_process_at": "2026-10-17T10:00:00Z",
+            "delivery_method": {"id": 1, "name": "Ozon Логистика", "warehouse_id": 1 + index % self.warehouses},
+            "products": [
+                {
+                    "offer_id": f"offer-{index % self.products}",
+                    "sku": 500000 + index % self.products,
+                    "quantity": 1 + index % 2,
+                    "name": f"Товар {index % self.products}",
+                    "price": "1990.00"
+                }
+            ],
+        }
+
+    @staticmethod
+    def _page(body: Dict[str, Any], total: int) -> range:
+        start = int(body.get("last_id") or 0)
+        return range(start, min(total, start + body.get("limit", 1000)))
+
+    async def _product_list(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        page = self._page(body, self.products)
+        return {"result": {
+            "items": [{"offer_id": f"offer-{index}", "product_id": 100000 + index} for index in page],
+            "total": self.products,
+            "last_id": str(page.stop) if len(page) else ""
+        }}
+
+    async def _product_info(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"result": {"items": [self._product(int(offer_id.rsplit('-', 1)[1])) for offer_id in body["offer_id"]]}}
+
+    async def _stocks(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        page = self._page(body, self.products)
+        return {"result": {
+            "items": [
+                {
+                    "offer_id": f"offer-{index}",
+                    "product_id": 100000 + index,
+                    "stocks": [
+                        {"type": "fbo", "present": index % 5, "reserved": 0},
+                        {"type": "fbs", "present": index % 17, "reserved": index % 3},
+                    ]
+                }
+                for index in page
+            ],
+            "total": self.products,
+            "last_id": str(page.stop) if len(page) else ""
+        }}
+
+    async def _stocks_fbs(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"result": [
+            {
+                "sku": sku,
+                "product_id": sku - 400000,
+                "present": sku % 17,
+                "reserved": sku % 3,
+                "warehouse_id": warehouse_id,
+                "warehouse_name": f"Склад {warehouse_id}"
+            }
+            for sku in body["sku"]
+            for warehouse_id in range(1, self.warehouses + 1)
+        ]}
+
+    async def _stocks_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        return {"result": [
+            {
+                "offer_id": item["offer_id"],
+                "product_id": item["product_id"],
+                "warehouse_id": item["warehouse_id"],
+                "updated": True,
+                "errors": []
+            }
+            for item in body["stocks"]
+        ]}
+
+    async def _unfulfilled(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        cutoff_from, cutoff_to = (
+            datetime.strptime(body["filter"][key], "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            for key in ("cutoff_from", "cutoff_to")
+        )
+        first = max(0, math.ceil((cutoff_from - SHIPMENT_START) / SHIPMENT_STEP))
+        last = min(self.postings, math.floor((cutoff_to - SHIPMENT_START) / SHIPMENT_STEP) + 1)
+        indexes = range(first, max(first, last))
+        if body.get("dir") == "DESC":
+            indexes = indexes[::-1]
+
+        offset, limit = body.get("offset", 0), body.get("limit", 1000)
+        postings = [self._posting(index) for index in indexes[offset:offset + limit]]
+        return {"result": {"postings": postings, "count": len(indexes)}}
+
+    @property
+    def handlers(self) -> Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]]:
+        """
+        Обработчики методов API: endpoint -> функция, принимающая тело запроса и возвращающая ответ.
+        Позволяют использовать замену API без HTTP, например в тестах.
+        """
+        return {
+            "v2/product/list": self._product_list,
+            "v2/product/info/list": self._product_info,
+            "v3/product/info/stocks": self._stocks,
+            "v1/product/info/stocks-by-warehouse/fbs": self._stocks_fbs,
+            "v2/products/stocks": self._stocks_update,
+            "v3/posting/fbs/unfulfilled/list": self._unfulfilled,
+        }
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = request.path.strip('/')
+        handler = self.handlers.get(endpoint)
+
+        if handler is None:
+            return web.json_response({"code": 5, "message": "Not found", "details": []}, status=404)
+
+        self._total += 1
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.throttle_every and (self._total % self.throttle_every == 0):
+            self.throttled += 1
+            return web.json_response(
+                {"code": 8, "message": "You have reached request rate limit per second", "details": []},
+                status=999,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+        return web.json_response(await handler(await request.json()))
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests, "throttled": self.throttled, "total": self._total})
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 1024 ** 2)
+        app.router.add_get("/_stats", self._stats)
+        app.router.add_post("/{endpoint:.*}", self._handle)
+        return app
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _serve(ready: "multiprocessing.synchronize.Event", options: Dict[str, Any]):
+    async def main():
+        server = MockOzonServer(**options)
+        await server.start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def start_in_process(**options: Any) -> multiprocessing.Process:
+    """
+    Запускает MockOzonServer в отдельном процессе, чтобы его нагрузка не попадала в замеры клиента.
+    Параметры передаются в MockOzonServer.
+    """
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=_serve, args=(ready, options), daemon=True)
+    process.start()
+
+    if not ready.wait(30):
+        process.terminate()
+        raise RuntimeError("Mock Ozon server did not start")
+
+    return process
@@ -0,0 +1,33 @@
+"""
+Асинхронный клиент OZON Seller API.
+
+Классы загружаются при первом обращении, поэтому ``import pyozonapi`` не импортирует aiohttp и pydantic,
+а OzonClient не загружает серверную часть aiohttp, нужную только OzonPushClient.
+"""
+_EXPORTS = {
+    "OzonClient": ".client",
+    "OzonPushClient": ".push",
+    "OzonClientManager": ".manager",
+    "PostingStore": ".store",
+    "StockUpdateBatcher": ".batcher",
+    "MemoryCache": ".cache",
+    "SqliteCache": ".cache",
+    "PrometheusSink": ".metrics",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,153 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+
+from .exceptions.api import BatchError
+from .models.stocks import StocksUpdateParams, StocksUpdateResponse
+
+if TYPE_CHECKING:
+    from .client import OzonClient
+
+Key = Tuple[str, int]
+
+
+class StockUpdateBatcher:
+    """
+    Накопитель обновлений остатков для OzonClient.stocks.update.
+
+    Принимает остатки по одной строке и отправляет их частями по batch_size строк: как только набралась полная
+    часть или через max_latency секунд после первой неотправленной строки. Строки с одинаковой парой
+    (offer_id, warehouse_id) объединяются, отправляется последний остаток. Пока строка отправляется,
+    новый остаток по той же паре ждет ответа, чтобы не обогнать предыдущий.
+
+    Доступен как OzonClient.stock_updates. OzonClient.close() отправляет накопленные строки.
+
+    :param client: OzonClient - Клиент для отправки обновлений.
+    :param batch_size: int - Количество строк в одном запросе (не больше 100).
+    :param max_latency: float - Максимальное время ожидания неполной части в секундах.
+    :param wait: bool - Ждать при достижении лимита на запросы.
+    :param delta: bool - Отправлять только изменившиеся остатки, см. OzonClient.stocks.update.
+    """
+    def __init__(
+            self,
+            client: "OzonClient",
+            batch_size: int = 100,
+            max_latency: float = 1.0,
+            wait: bool = True,
+            delta: bool = False
+    ):
+        self._client = client
+        self.batch_size: int = max(1, min(100, batch_size))
+        self.max_latency: float = max_latency
+        self.wait: bool = wait
+        self.delta: bool = delta
+        self._pending: Dict[Key, Tuple[StocksUpdateParams, List[asyncio.Future]]] = {}
+        self._inflight: Set[Key] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, params: StocksUpdateParams) -> "asyncio.Future[Optional[StocksUpdateResponse.Offer]]":
+        """
+        Добавляет строку в очередь на отправку.
+
+        :return: Future с результатом по строке из StocksUpdateResponse. Результат None, если строка не отправлялась
+            из-за delta=True. При ошибке запроса Future завершается этой ошибкой.
+        """
+        future = asyncio.get_running_loop().create_future()
+        key = (params.offer_id, params.warehouse_id)
+
+        pending = self._pending.pop(key, None)
+        futures = pending[1] if pending is not None else []
+        futures.append(future)
+        self._pending[key] = (params, futures)
+
+        self._schedule()
+        return future
+
+    async def update(self, params: StocksUpdateParams) -> Optional[StocksUpdateResponse.Offer]:
+        """
+        Добавляет строку в очередь и ожидает результат ее отправки.
+        """
+        return await self.submit(params)
+
+    async def flush(self):
+        """
+        Отправляет все накопленные строки и ожидает ответов.
+        """
+        while self._pending or self._tasks:
+            self._send_ready(force=True)
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _schedule(self):
+        self._send_ready()
+
+        if not self._pending:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_latency, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._send_ready(force=True)
+        self._schedule()
+
+    def _send_ready(self, force: bool = False):
+        """
+        Отправляет полные части. При force=True отправляет и неполную часть.
+        """
+        ready = [key for key in self._pending if key not in self._inflight]
+
+        while (len(ready) >= self.batch_size) or (force and ready):
+            keys, ready = ready[:self.batch_size], ready[self.batch_size:]
+            batch = {key: self._pending.pop(key) for key in keys}
+            self._inflight.update(keys)
+
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: Dict[Key, Tuple[StocksUpdateParams, List[asyncio.Future]]]):
+        response: Optional[StocksUpdateResponse] = None
+        error: Optional[BaseException] = None
+        cancelled = True
+        try:
+            response = await self._client.stocks.update(
+                [params for params, _ in batch.values()], wait=self.wait, delta=self.delta
+            )
+            cancelled = False
+        except BatchError as exc:
+            response, error, cancelled = exc.result, exc, False
+        except Exception as exc:
+            error, cancelled = exc, False
+        finally:
+            # При отмене отправки (например, при остановке приложения) ключи освобождаются, а ожидающие
+            # результата отменяются, иначе новые строки по этим ключам никогда не будут отправлены.
+            by_key = response.by_offer_warehouse if response is not None else {}
+
+            for key, (_, futures) in batch.items():
+                self._inflight.discard(key)
+                offer = by_key.get(key)
+                for future in futures:
+                    if future.done():
+                        continue
+                    if cancelled:
+                        future.cancel()
+                    elif (offer is None) and (error is not None):
+                        future.set_exception(error)
+                    else:
+                        future.set_result(offer)
+
+            if self._pending:
+                self._schedule()
@@ -0,0 +1,287 @@
+import os
+import json
+import time
+import pickle
+import sqlite3
+from hashlib import blake2b
+from datetime import date, datetime
+from collections import OrderedDict
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple
+)
+
+# Значение, которое возвращает BaseCache.get при отсутствии записи.
+MISSING = object()
+
+# Количество ключей в одном запросе SqliteCache.get_many.
+SQLITE_MAX_VARIABLES = 900
+
+
+class BaseCache:
+    """
+    Интерфейс хранилища кэша. Ключи - строки, значения - произвольные объекты.
+    """
+
+    def get(self, key: str) -> Any:
+        """
+        Возвращает значение по ключу или MISSING, если записи нет или она устарела.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """
+        Сохраняет значение на ttl секунд. Если ttl не указан или равен 0 - без ограничения по времени.
+        """
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Возвращает значения по ключам. Ключей без записи или с устаревшей записью в результате нет.
+        """
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not MISSING:
+                values[key] = value
+        return values
+
+    def set_many(self, values: Dict[str, Any], ttl: Optional[float] = None):
+        """
+        Сохраняет значения по ключам на ttl секунд.
+        """
+        for key, value in values.items():
+            self.set(key, value, ttl)
+
+    def delete(self, key: str) -> bool:
+        """
+        Удаляет запись. Возвращает True, если запись была.
+        """
+        raise NotImplementedError
+
+    def clear(self, prefix: str = "") -> int:
+        """
+        Удаляет записи, ключи которых начинаются с prefix. Возвращает количество удаленных записей.
+        """
+        raise NotImplementedError
+
+    def purge(self) -> int:
+        """
+        Удаляет устаревшие записи. Возвращает количество удаленных записей.
+        """
+        raise NotImplementedError
+
+
+class MemoryCache(BaseCache):
+    """
+    Кэш в памяти с вытеснением давно не используемых записей (LRU).
+
+    Устаревшие записи удаляются при обращении к ним, а также все сразу не чаще раза в purge_interval секунд.
+
+    :param maxsize: int - Максимальное количество записей. None - без ограничения.
+    :param purge_interval: float - Период полной очистки устаревших записей в секундах.
+    """
+    def __init__(self, maxsize: Optional[int] = 1024, purge_interval: float = 60):
+        self.maxsize: Optional[int] = maxsize
+        self.purge_interval: float = purge_interval
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._purged_at: float = time.time()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any:
+        item = self._data.get(key)
+
+        if item is None:
+            return MISSING
+
+        value, expiration = item
+
+        if (expiration is not None) and (time.time() >= expiration):
+            del self._data[key]
+            return MISSING
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+
+        if now - self._purged_at >= self.purge_interval:
+            self.purge()
+
+        self._data[key] = (value, (now + ttl) if ttl else None)
+        self._data.move_to_end(key)
+
+        while (self.maxsize is not None) and (len(self._data) > self.maxsize):
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> bool:
+        return self._data.pop(key, MISSING) is not MISSING
+
+    def clear(self, prefix: str = "") -> int:
+        keys = [key for key in self._data if key.startswith(prefix)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def purge(self) -> int:
+        now = time.time()
+        self._purged_at = now
+        keys = [key for key, (_, expiration) in self._data.items() if (expiration is not None) and (now >= expiration)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+
+class SqliteCache(BaseCache):
+    """
+    Кэш в файле SQLite. Переживает перезапуск процесса: ответы, сохраненные до перезапуска,
+    отдаются из файла, пока не истечет их ttl.
+
+    Значения сериализуются через pickle, поэтому файл кэша должен быть доступен только самому приложению.
+    Один файл могут использовать несколько процессов, в том числе созданных через fork: дочерний процесс
+    открывает собственное соединение.
+
+    :param path: str - Путь к файлу базы данных.
+    :param purge_interval: float - Период полной очистки устаревших записей в секундах.
+    """
+    def __init__(self, path: str = "pyozonapi-cache.sqlite", purge_interval: float = 600):
+        self.path: str = path
+        self.purge_interval: float = purge_interval
+        self._purged_at: float = 0.0
+        self._connect()
+
+    def _connect(self):
+        self._pid: int = os.getpid()
+        self._db: sqlite3.Connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expiration REAL)"
+        )
+
+    @property
+    def _connection(self) -> sqlite3.Connection:
+        # Соединение SQLite нельзя использовать после fork, поэтому в дочернем процессе открывается новое.
+        if self._pid != os.getpid():
+            self._connect()
+        return self._db
+
+    def get(self, key: str) -> Any:
+        row = self._connection.execute("SELECT value, expiration FROM cache WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            return MISSING
+
+        value, expiration = row
+
+        if (expiration is not None) and (time.time() >= expiration):
+            self.delete(key)
+            return MISSING
+
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+
+        if now - self._purged_at >= self.purge_interval:
+            self.purge()
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), (now + ttl) if ttl else None)
+        )
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        now = time.time()
+        values = {}
+
+        # Старые версии SQLite ограничивают запрос 999 параметрами.
+        for start in range(0, len(keys), SQLITE_MAX_VARIABLES):
+            chunk = keys[start:start + SQLITE_MAX_VARIABLES]
+            rows = self._connection.execute(
+                f"SELECT key, value FROM cache WHERE key IN ({', '.join('?' * len(chunk))})"
+                " AND (expiration IS NULL OR expiration > ?)",
+                (*chunk, now)
+            )
+            for key, value in rows:
+                values[key] = pickle.loads(value)
+
+        return values
+
+    def set_many(self, values: Dict[str, Any], ttl: Optional[float] = None):
+        now = time.time()
+
+        if now - self._purged_at >= self.purge_interval:
+            self.purge()
+
+        expiration = (now + ttl) if ttl else None
+        connection = self._connection
+
+        # Одна транзакция вместо отдельной записи на диск для каждого значения.
+        connection.execute("BEGIN")
+        try:
+            connection.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expiration) VALUES (?, ?, ?)",
+                (
+                    (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expiration)
+                    for key, value in values.items()
+                )
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def delete(self, key: str) -> bool:
+        return self._connection.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self, prefix: str = "") -> int:
+        return self._connection.execute(
+            "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        ).rowcount
+
+    def purge(self) -> int:
+        now = time.time()
+        self._purged_at = now
+        return self._connection.execute(
+            "DELETE FROM cache WHERE expiration IS NOT NULL AND expiration <= ?", (now,)
+        ).rowcount
+
+    def close(self):
+        """
+        Закрывает соединение с базой данных.
+        """
+        self._connection.close()
+
+
+def _default(value: Any) -> Any:
+    # Ответы с KEY_FIELDS учитываются только по идентификаторам offers, без сериализации всех полей.
+    key = value._fingerprint() if hasattr(value, '_fingerprint') else None
+    if key is not None:
+        return [type(value).__qualname__, key]
+    if hasattr(value, 'model_dump'):
+        try:
+            return [type(value).__qualname__, value.model_dump(mode='json', warnings=False)]
+        except ValueError:
+            # В модели есть значения, которые pydantic не сериализует, например записи CompactRecord.
+            return [type(value).__qualname__, {name: getattr(value, name) for name in type(value).model_fields}]
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return repr(value)
+
+
+def fingerprint(arguments: Dict[str, Any]) -> str:
+    """
+    Возвращает стабильный отпечаток аргументов вызова.
+    Модели pydantic учитываются по содержимому, а не по id объекта.
+    """
+    data = json.dumps(arguments, sort_keys=True, default=_default, ensure_ascii=False)
+    return blake2b(data.encode(), digest_size=16).hexdigest()
@@ -1,24 +1,34 @@
 import asyncio
-from datetime import datetime
+from time import perf_counter
+from functools import cached_property
 from typing import (
+    TYPE_CHECKING,
+    Any,
     Literal,
     Optional,
     Dict,
+    Tuple,
     Callable
 )
-from aiohttp import ClientSession
-from aiohttp import web
+from aiohttp import ClientSession, TCPConnector, ClientConnectionError
 
-from .modules.stocks import Stocks
-from .modules.product import Product
-from .modules.posting import Posting
 from .exceptions.api import ApiError
-from .models.base import BasePushEvent
-from .models.push import (
-    PushNewPosting,
-    PushPostingCancelled,
-    PushStateChanged,
-)
+from .limiter import FairScheduler, RateLimiter, backoff_delay
+from .cache import BaseCache, MemoryCache
+from .types import Model_Modes
+from .codec import JsonCodec, default_codec
+from .metrics import MetricsSink
+
+if TYPE_CHECKING:
+    from .modules.stocks import Stocks
+    from .modules.product import Product
+    from .modules.posting import Posting
+    from .modules.sync import Sync
+    from .batcher import StockUpdateBatcher
+
+THROTTLE_STATUSES = (429, 999)
+RETRY_STATUSES = (500, 502, 503, 504)
+
 # Провести тесты всех функций, пуш-уведомлений и кэша.
 # В случае нахождения ошибки - исправить. Коммитнуть исправления.
 # Добавить __init__. И привести библиотеку к общему виду
@@ -31,6 +41,36 @@ class OzonClient:
     :param client_id: str - Client Id от OZON Seller
     :param base_url: str - Основная ссылка для API запросов
     :param locale: "RU" | "EN" - Язык ответов
+    :param ttl: int - Время жизни кэша в секундах. Если не указано, кэш не используется
+    :param item_ttl: int - Время жизни кэша отдельных товаров в OzonClient.product.get_info в секундах.
+        Если указано, запрашиваются только новые и устаревшие товары
+    :param cache: BaseCache - Хранилище кэша. По умолчанию MemoryCache(cache_size), для хранения между перезапусками - SqliteCache
+    :param item_cache: BaseCache - Хранилище кэша отдельных товаров. Отделено от cache, чтобы записи каталога
+        не вытесняли кэш ответов. По умолчанию MemoryCache без ограничения размера, устаревшие записи удаляются
+    :param cache_size: int - Максимальное количество записей в кэше по умолчанию
+    :param pool_size: int - Максимальное количество соединений в пуле
+    :param pool_size_per_host: int - Максимальное количество соединений к одному хосту (0 - без ограничений)
+    :param dns_cache_ttl: int - Время жизни DNS кэша в секундах
+    :param keepalive_timeout: float - Время удержания простаивающего соединения в секундах
+    :param max_concurrency: int - Максимальное количество одновременных запросов
+    :param rate_limits: dict - Лимиты методов {endpoint: (запросов, период в секундах)}, см. limiter.ENDPOINT_RATE_LIMITS
+    :param max_retries: int - Максимальное количество повторов запроса
+    :param backoff_base: float - Базовая задержка между повторами в секундах
+    :param backoff_max: float - Максимальная задержка между повторами в секундах
+    :param chunk_concurrency: int - Количество одновременно отправляемых частей в пакетных методах
+    :param stock_batch_size: int - Количество строк в одном запросе stock_updates (не больше 100)
+    :param stock_max_latency: float - Максимальное время ожидания неполной части stock_updates в секундах
+    :param stock_delta: bool - stock_updates отправляет только изменившиеся остатки, см. OzonClient.stocks.update
+    :param model_mode: Model_Modes - Способ создания моделей ответов: "validate", "bulk", "lazy" или "compact",
+        см. models.base.build_models. "compact" не преобразует типы: даты остаются строками
+    :param codec: JsonCodec - Кодек JSON. По умолчанию orjson или msgspec, если установлены, иначе стандартный json
+    :param metrics: MetricsSink - Приемник метрик запросов, например PrometheusSink. По умолчанию метрики не собираются
+    :param shared_session: Функция, возвращающая общую сессию нескольких клиентов. Заголовки авторизации
+        передаются в каждом запросе, а close() не закрывает общую сессию. См. OzonClientManager
+    :param scheduler: FairScheduler - Общий лимит одновременных запросов нескольких клиентов
+
+    Клиент держит одну сессию с пулом keep-alive соединений. Сессия создается при первом запросе
+    и закрывается через close() или при выходе из ``async with OzonClient(...) as client``.
     """
     def __init__(
             self,
@@ -38,7 +78,29 @@ class OzonClient:
             client_id: str,
             base_url: str = "https://api-seller.ozon.ru/",
             locale: Literal["RU", "EN"] = "RU",
-            ttl: Optional[int] = None
+            ttl: Optional[int] = None,
+            item_ttl: Optional[int] = None,
+            cache: Optional[BaseCache] = None,
+            item_cache: Optional[BaseCache] = None,
+            cache_size: int = 1024,
+            pool_size: int = 100,
+            pool_size_per_host: int = 0,
+            dns_cache_ttl: int = 300,
+            keepalive_timeout: float = 30,
+            max_concurrency: int = 10,
+            rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+            max_retries: int = 5,
+            backoff_base: float = 0.5,
+            backoff_max: float = 60,
+            chunk_concurrency: int = 4,
+            stock_batch_size: int = 100,
+            stock_max_latency: float = 1.0,
+            stock_delta: bool = False,
+            model_mode: Model_Modes = "bulk",
+            codec: Optional[JsonCodec] = None,
+            metrics: Optional[MetricsSink] = None,
+            shared_session: Optional[Callable[[], ClientSession]] = None,
+            scheduler: Optional[FairScheduler] = None
     ):
         self.api_key: str = api_key
         self.client_id: str = client_id
@@ -49,11 +111,109 @@ class OzonClient:
         self.base_url: str = base_url
         self.locale: Literal["RU", "EN"] = locale
         self.ttl: Optional[int] = ttl
-        self.stocks: Stocks = Stocks(self)
-        self.product: Product = Product(self)
-        self.posting: Posting = Posting(self)
+        self.item_ttl: Optional[int] = item_ttl
+        self.cache: BaseCache = cache if cache is not None else MemoryCache(cache_size)
+        self.item_cache: BaseCache = item_cache if item_cache is not None else MemoryCache(None)
+        self.cache_namespace: str = str(client_id)
+        self.pool_size: int = pool_size
+        self.pool_size_per_host: int = pool_size_per_host
+        self.dns_cache_ttl: int = dns_cache_ttl
+        self.keepalive_timeout: float = keepalive_timeout
+        self._session: Optional[ClientSession] = None
+        self._shared_session: Optional[Callable[[], ClientSession]] = shared_session
+        self.limiter: RateLimiter = RateLimiter(
+            rate_limits, max_concurrency=max_concurrency, scheduler=scheduler, account=self.cache_namespace
+        )
+        self.max_retries: int = max_retries
+        self.backoff_base: float = backoff_base
+        self.backoff_max: float = backoff_max
+        self.chunk_concurrency: int = chunk_concurrency
+        self.stock_batch_size: int = stock_batch_size
+        self.stock_max_latency: float = stock_max_latency
+        self.stock_delta: bool = stock_delta
+        self.model_mode: Model_Modes = model_mode
+        self.codec: JsonCodec = codec if codec is not None else default_codec()
+        self.metrics: MetricsSink = metrics if metrics is not None else MetricsSink()
         self.warehouse = None
 
+    # Модули и их модели импортируются при первом обращении к ним.
+
+    @cached_property
+    def stocks(self) -> "Stocks":
+        from .modules.stocks import Stocks
+        return Stocks(self)
+
+    @cached_property
+    def product(self) -> "Product":
+        from .modules.product import Product
+        return Product(self)
+
+    @cached_property
+    def posting(self) -> "Posting":
+        from .modules.posting import Posting
+        return Posting(self)
+
+    @cached_property
+    def sync(self) -> "Sync":
+        from .modules.sync import Sync
+        return Sync(self)
+
+    @cached_property
+    def stock_updates(self) -> "StockUpdateBatcher":
+        from .batcher import StockUpdateBatcher
+        return StockUpdateBatcher(
+            self, batch_size=self.stock_batch_size, max_latency=self.stock_max_latency, delta=self.stock_delta
+        )
+
+    async def __aenter__(self) -> "OzonClient":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _get_session(self) -> ClientSession:
+        """
+        Возвращает общую сессию клиента, создавая ее при необходимости.
+        """
+        if self._shared_session is not None:
+            return self._shared_session()
+
+        if (self._session is None) or self._session.closed:
+            connector = TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = ClientSession(headers=self.headers, base_url=self.base_url, connector=connector)
+        return self._session
+
+    async def close(self):
+        """
+        Отправляет накопленные в stock_updates остатки, затем закрывает сессию и все соединения пула.
+        """
+        if "stock_updates" in self.__dict__:
+            await self.stock_updates.flush()
+
+        if (self._session is not None) and (not self._session.closed):
+            await self._session.close()
+        self._session = None
+
+    def invalidate_cache(self, method: Optional[str] = None) -> int:
+        """
+        Удаляет записи кэша клиента.
+
+        :param method: str - Метод модуля, например "Stocks.get". Если не указан, удаляется весь кэш клиента.
+
+        :return: Количество удаленных записей.
+        """
+        prefix = f"{self.cache_namespace}:{method}:" if method else f"{self.cache_namespace}:"
+        removed = self.cache.clear(prefix)
+        if self.item_cache is not self.cache:
+            removed += self.item_cache.clear(prefix)
+        return removed
+
     async def fetch(
             self,
             method: Literal["get", "post", "put"],
@@ -62,110 +222,105 @@ class OzonClient:
             time: Optional[int] = None,
             **kwargs
     ):
-        async with ClientSession(headers=self.headers, base_url=self.base_url) as session:
-            session_method = getattr(session, method.lower(), None)
+        """
+        Выполняет запрос к API с учетом лимитов методов.
 
-            if session_method is None:
-                raise ValueError(f"HTTP метод {method.lower()} не поддерживается."
-                                 if self.locale == "RU" else
-                                 f"HTTP method {method.lower()} is not supported.")
+        Ошибки соединения и ответы 5xx повторяются до max_retries раз с экспоненциальной задержкой.
+        Ответы о превышении лимита (429, 999) повторяются только при wait=True.
 
-            async with session_method(url=endpoint, **kwargs) as response:
-                data = await response.json()
+        :param method: "get" | "post" | "put" - HTTP метод.
+        :param endpoint: str - Метод API.
+        :param wait: bool - Ждать при достижении лимита на запросы.
+        :param time: int - Максимальная пауза между повторами в секундах. По умолчанию backoff_max.
+        :param kwargs: Параметры запроса aiohttp. Тело json кодируется через OzonClient.codec.
+        """
+        session = self._get_session()
+        session_method = getattr(session, method.lower(), None)
 
-            if response.status != 200:
+        if session_method is None:
+            raise ValueError(f"HTTP метод {method.lower()} не поддерживается."
+                             if self.locale == "RU" else
+                             f"HTTP method {method.lower()} is not supported.")
 
-                if wait and (time is not None) and (response.status == 999):
-                    await asyncio.sleep(time)
-                    return await self.fetch(method, endpoint, wait, time, **kwargs)
+        metrics = self.metrics
+        labels = {"endpoint": endpoint}
 
-                raise ApiError(response.status, data, self.locale)
+        if self._shared_session is not None:
+            kwargs["headers"] = {**self.headers, **kwargs.get("headers", {})}
 
-            return data
+        if "json" in kwargs:
+            kwargs["data"] = self.codec.dumps(kwargs.pop("json"))
+            kwargs["headers"] = {**kwargs.get("headers", {}), "Content-Type": "application/json"}
 
+        if isinstance(kwargs.get("data"), bytes):
+            metrics.observe("ozon_request_bytes", len(kwargs["data"]), labels)
 
-class OzonPushClient:
+        cap = time if time is not None else self.backoff_max
+        attempt = 0
 
-    def __init__(
-            self,
-            host: str = '0.0.0.0',
-            port: int  = 8080,
-            webhook_path: str = "/ozon/push",
-            version: str = '1.0',
-            name: str = 'Bot'
-    ):
-        """
-        :param host: Хост, на котором будет запущен сервер.
-        :param port: Порт, на котором будет запущен сервер.
-        :param webhook_path: Путь, на который будут приходить уведомления.
-        """
-        self.host: str = host
-        self.port: int = port
-        self.webhook_path: str = webhook_path
-        self.version: str = version
-        self.name: str = name
-        self.app = web.Application()
-        self.app.router.add_post(self.webhook_path, self._handle_push)
-        self._on_event: Optional[Callable[[BasePushEvent], None]] = None
-
-    def on_event(self, callback: Callable[[BasePushEvent], None]):
-        """
-        Устанавливает функцию обратного вызова для обработки событий.
-        """
-        self._on_event = callback
+        while True:
+            hint = None
+            throttled = False
+
+            try:
+                async with self.limiter.slot(endpoint):
+                    started = perf_counter()
+                    try:
+                        async with session_method(url=f"/{endpoint.lstrip('/')}", **kwargs) as response:
+                            raw = await response.read()
+                    finally:
+                        metrics.observe("ozon_request_seconds", perf_counter() - started, labels)
+
+                try:
+                    data = self.codec.loads(raw) if raw else None
+                except ValueError:
+                    data = None
+                hint = self._retry_hint(response.headers.get("Retry-After"))
+
+            except (ClientConnectionError, asyncio.TimeoutError):
+                metrics.increment("ozon_requests_total", {"endpoint": endpoint, "status": "error"})
+                if attempt >= self.max_retries:
+                    raise
+
+            else:
+                metrics.increment("ozon_requests_total", {"endpoint": endpoint, "status": str(response.status)})
+                metrics.observe("ozon_response_bytes", len(raw), labels)
 
-    async def _handle_push(self, request: web.Request):
+                if response.status == 200:
+                    return data
+
+                throttled = response.status in THROTTLE_STATUSES
+                if throttled:
+                    metrics.increment("ozon_throttled_total", labels)
+
+                retryable = (throttled and wait) or (response.status in RETRY_STATUSES)
+
+                if (not retryable) or (attempt >= self.max_retries):
+                    raise ApiError(response.status, data, self.locale)
+
+            delay = backoff_delay(attempt, self.backoff_base, cap, hint)
+
+            if throttled:
+                self.limiter.bucket(endpoint).pause(delay)
+
+            metrics.increment("ozon_retries_total", labels)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _retry_hint(value: Optional[str]) -> Optional[float]:
         """
-        Обрабатывает входящие push-уведомления от Ozon Seller API.
+        Возвращает время ожидания из заголовка Retry-After в секундах.
         """
         try:
-            date = datetime.now()
-            data = await request.json()
-            event = BasePushEvent(**data)
-            if event.message_type == 'TYPE_NEW_POSTING':
-                event = PushNewPosting(**data)
-            if event.message_type == 'TYPE_POSTING_CANCELLED':
-                event = PushPostingCancelled(**data)
-            if event.message_type == 'TYPE_STATE_CHANGED':
-                event = PushStateChanged(**data)
-
-            if self._on_event:
-                await self._on_event(event)
-
-            body = {
-                'result': True
-            }
-
-            if event.message_type == "TYPE_PING":
-                body = {
-                    "version": self.version,
-                    "name": self.name,
-                    "time": str(date.strftime('%Y-%m-%dT%H:%M:%SZ'))
-                }
-
-            return web.Response(body=body, status=200)
-        except:
-            return web.Response(body={
-                "error": {
-                    "code": "ERROR_UNKNOWN",
-                    "message": "ошибка",
-                    "details": None
-                }
-            }, status=400)
-
-    async def start(self):
-        """
-        Запускает сервер для приема уведомлений.
-        """
-        runner = web.AppRunner(self.app)
-        await runner.setup()
-        site = web.TCPSite(runner, self.host, self.port)
-        await site.start()
-        print(f"Server started at http://{self.host}:{self.port}{self.webhook_path}")
+            return max(0.0, float(value)) if value is not None else None
+        except ValueError:
+            return None
 
-    async def stop(self):
-        """
-        Останавливает сервер.
-        """
-        await self.app.shutdown()
-        await self.app.cleanup()
+
+def __getattr__(name: str) -> Any:
+    # OzonPushClient и серверная часть aiohttp загружаются только при обращении к ним.
+    if name == "OzonPushClient":
+        from .push import OzonPushClient
+        return OzonPushClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
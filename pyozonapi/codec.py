@@ -0,0 +1,79 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """
+    Кодек JSON для тел запросов, ответов и push-уведомлений.
+    dumps возвращает bytes, loads принимает bytes и при ошибке разбора вызывает ValueError.
+    """
+
+    name: str = "json"
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    Кодек на основе orjson.
+    """
+
+    name: str = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, default=_default)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec(JsonCodec):
+    """
+    Кодек на основе msgspec.
+    """
+
+    name: str = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._error = msgspec.DecodeError
+        self._encoder = msgspec.json.Encoder(enc_hook=_default)
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value)
+
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._error as exc:
+            raise ValueError(str(exc)) from exc
+
+
+def default_codec() -> JsonCodec:
+    """
+    Возвращает самый быстрый из установленных кодеков: orjson, msgspec или стандартный json.
+    """
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec()
+        except ImportError:
+            continue
+    return JsonCodec()
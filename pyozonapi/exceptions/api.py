@@ -1,18 +1,63 @@
 from typing import (
     Literal,
-    Dict
+    Dict,
+    Any
 )
 
 class ApiError(Exception):
 
-    messages: Dict[str, Dict[str, str]] = {
-        "": ""
+    messages: Dict[str, Dict[int, str]] = {
+        "RU": {
+            0: "Неизвестная ошибка",
+            400: "Неверный параметр",
+            403: "Доступ запрещён",
+            404: "Ответ не найден",
+            409: "Конфликт запроса",
+            429: "Превышен лимит запросов",
+            500: "Внутренняя ошибка сервера",
+            502: "Сервер временно недоступен",
+            503: "Сервер временно недоступен",
+            504: "Превышено время ожидания ответа сервера",
+            999: "Превышен лимит запросов",
+        },
+        "EN": {
+            0: "Unknown error",
+            400: "Invalid parameter",
+            403: "Access denied",
+            404: "Response not found",
+            409: "Request conflict",
+            429: "Request limit exceeded",
+            500: "Internal server error",
+            502: "Server temporarily unavailable",
+            503: "Server temporarily unavailable",
+            504: "Server response timeout",
+            999: "Request limit exceeded",
+        },
     }
 
-    def __init__(self, status: int, data: dict, locale: Literal["RU", "EN"]):
+    def __init__(self, status: int, data: Any, locale: Literal["RU", "EN"]):
+        data = data if isinstance(data, dict) else {}
         self.status = status
         self.code = data.get('code')
         self.details = data.get('details')
         self.message = self.messages[locale].get(status) if status in self.messages[locale] else self.messages[locale][0]
         super().__init__(f"{'Статус' if locale == 'RU' else 'Status'}: {self.status}; {self.message}; "
                          f"{'Детали' if locale == 'RU' else 'Details'}: {self.details}")
+
+
+class BatchError(Exception):
+    """
+    Часть пакетного запроса завершилась ошибкой.
+
+    :param result: Модель ответа, собранная из успешно выполненных частей.
+    :param errors: dict - Ошибки по номерам частей запроса или по client_id в OzonClientManager.
+    """
+
+    def __init__(self, result: Any, errors: Dict[Any, BaseException], locale: Literal["RU", "EN"]):
+        self.result = result
+        self.errors = errors
+        super().__init__(
+            f"Не выполнено частей запроса: {len(errors)}; Ошибки: {list(errors.values())}"
+            if locale == "RU" else
+            f"Failed request chunks: {len(errors)}; Errors: {list(errors.values())}"
+        )
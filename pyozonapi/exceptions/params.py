@@ -10,3 +10,14 @@ class ParamLimitError(Exception):
             if locale == "RU" else
             "limit parameter must be greater than 0!"
         )
+
+
+class ClientExistsError(Exception):
+
+    def __init__(self, client_id: str, locale: Literal["RU", "EN"]):
+        self.client_id: str = client_id
+        super().__init__(
+            f"Продавец {client_id} уже добавлен! Удалите его через remove() перед повторным добавлением."
+            if locale == "RU" else
+            f"Seller {client_id} is already added! Remove it with remove() before adding it again."
+        )
@@ -0,0 +1,219 @@
+import asyncio
+import random
+from time import monotonic
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import (
+    AsyncIterator,
+    Deque,
+    Dict,
+    Optional,
+    Tuple
+)
+
+# Лимиты методов OZON Seller API: (количество запросов, период в секундах).
+# Методы, которых нет в словаре, ограничиваются DEFAULT_RATE_LIMIT.
+ENDPOINT_RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "v2/products/stocks": (80, 60),
+    "v2/product/list": (50, 1),
+    "v2/product/info/list": (50, 1),
+    "v3/product/info/stocks": (50, 1),
+    "v1/product/info/stocks-by-warehouse/fbs": (50, 1),
+    "v3/posting/fbs/unfulfilled/list": (50, 1),
+}
+
+DEFAULT_RATE_LIMIT: Tuple[int, float] = (50, 1)
+
+
+class TokenBucket:
+    """
+    Корзина токенов для ограничения частоты запросов.
+
+    :param requests: int - Количество запросов за период.
+    :param period: float - Период в секундах.
+    """
+    def __init__(self, requests: int, period: float):
+        self.capacity: float = float(requests)
+        self.rate: float = requests / period
+        self._tokens: float = self.capacity
+        self._updated: float = monotonic()
+        self._paused_until: float = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """
+        Ожидает освобождения токена. Ожидающие обслуживаются в порядке очереди.
+        """
+        async with self._lock:
+            while True:
+                now = monotonic()
+
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def pause(self, delay: float):
+        """
+        Приостанавливает выдачу токенов на delay секунд и сбрасывает накопленный запас.
+        Используется, когда API уже ответило превышением лимита.
+        """
+        self._paused_until = max(self._paused_until, monotonic() + delay)
+        self._tokens = 0.0
+        self._updated = self._paused_until
+
+
+class FairScheduler:
+    """
+    Общий лимит одновременных запросов нескольких аккаунтов.
+
+    Освободившееся место отдается аккаунтам по очереди, поэтому аккаунт с большим количеством ожидающих
+    запросов не задерживает остальные.
+
+    :param max_concurrency: int - Максимальное количество одновременных запросов всех аккаунтов.
+    """
+    def __init__(self, max_concurrency: int = 20):
+        self.max_concurrency: int = max_concurrency
+        self._active: int = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    async def acquire(self, account: str):
+        """
+        Ожидает свободного места для запроса аккаунта.
+        """
+        if (self._active < self.max_concurrency) and (not self._waiters):
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(account, deque()).append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and (not future.cancelled()):
+                self.release()
+            else:
+                waiters = self._waiters.get(account)
+                if (waiters is not None) and (future in waiters):
+                    waiters.remove(future)
+                    if not waiters:
+                        del self._waiters[account]
+            raise
+
+    def release(self):
+        """
+        Освобождает место и передает его следующему по очереди аккаунту.
+        """
+        while self._waiters:
+            account, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+
+            if waiters:
+                self._waiters.move_to_end(account)
+            else:
+                del self._waiters[account]
+
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._active -= 1
+
+    @asynccontextmanager
+    async def slot(self, account: str) -> AsyncIterator[None]:
+        await self.acquire(account)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class RateLimiter:
+    """
+    Планировщик запросов: корзина токенов на каждый метод API и общий лимит одновременных запросов.
+
+    :param rate_limits: dict - Лимиты методов {endpoint: (запросов, период в секундах)}, дополняют ENDPOINT_RATE_LIMITS.
+    :param default_rate_limit: tuple - Лимит для методов, которых нет в rate_limits.
+    :param max_concurrency: int - Максимальное количество одновременных запросов.
+    :param scheduler: FairScheduler - Общий лимит нескольких аккаунтов.
+    :param account: str - Аккаунт в scheduler.
+    """
+    def __init__(
+            self,
+            rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+            default_rate_limit: Tuple[int, float] = DEFAULT_RATE_LIMIT,
+            max_concurrency: int = 10,
+            scheduler: Optional[FairScheduler] = None,
+            account: str = ""
+    ):
+        self.rate_limits: Dict[str, Tuple[int, float]] = {**ENDPOINT_RATE_LIMITS, **(rate_limits or {})}
+        self.default_rate_limit: Tuple[int, float] = default_rate_limit
+        self.max_concurrency: int = max_concurrency
+        self.scheduler: Optional[FairScheduler] = scheduler
+        self.account: str = account
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """
+        Возвращает корзину токенов метода.
+        """
+        endpoint = endpoint.strip('/')
+        bucket = self._buckets.get(endpoint)
+
+        if bucket is None:
+            bucket = TokenBucket(*self.rate_limits.get(endpoint, self.default_rate_limit))
+            self._buckets[endpoint] = bucket
+
+        return bucket
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str) -> AsyncIterator[None]:
+        """
+        Резервирует место среди одновременных запросов, затем токен метода.
+
+        Токен берется последним, непосредственно перед отправкой: токены, полученные заранее, копились бы
+        во время ожидания места и расходовались разом, превышая лимит метода.
+        """
+        async with self._semaphore:
+            if self.scheduler is None:
+                await self.bucket(endpoint).acquire()
+                yield
+            else:
+                async with self.scheduler.slot(self.account):
+                    await self.bucket(endpoint).acquire()
+                    yield
+
+
+def backoff_delay(attempt: int, base: float, cap: float, hint: Optional[float] = None) -> float:
+    """
+    Возвращает паузу перед повтором: экспоненциальная задержка с полным джиттером.
+    Если API сообщило время ожидания (hint), пауза не будет меньше него.
+
+    :param attempt: int - Номер повтора, начиная с 0.
+    :param base: float - Базовая задержка в секундах.
+    :param cap: float - Максимальная задержка в секундах.
+    :param hint: float - Время ожидания из ответа API.
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+
+    if hint is not None:
+        delay = hint + random.uniform(0, base)
+
+    return delay
@@ -0,0 +1,249 @@
+import asyncio
+from datetime import datetime
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    TypeVar
+)
+
+from aiohttp import ClientSession, TCPConnector
+
+from .cache import BaseCache, MemoryCache
+from .client import OzonClient
+from .codec import JsonCodec, default_codec
+from .exceptions.api import BatchError
+from .exceptions.params import ClientExistsError
+from .limiter import FairScheduler
+from .metrics import MetricsSink
+from .models.posting import PostingUnfulfilledResponse
+from .models.stocks import StocksResponse, StocksSyncResponse
+from .types import Posting_Statuses
+
+T = TypeVar("T")
+
+
+class OzonClientManager:
+    """
+    Клиенты нескольких продавцов с общим пулом соединений.
+
+    Каждый продавец получает свой OzonClient со своими лимитами методов, а одновременные запросы всех продавцов
+    ограничены общим max_concurrency и распределяются между продавцами по очереди (FairScheduler).
+    Кэш, кодек и приемник метрик общие, записи кэша разделены по client_id.
+
+        async with OzonClientManager() as manager:
+            manager.add(api_key, client_id)
+            stocks = await manager.get_stocks()
+
+    :param base_url: str - Основная ссылка для API запросов.
+    :param locale: "RU" | "EN" - Язык ответов.
+    :param max_concurrency: int - Максимальное количество одновременных запросов всех продавцов.
+    :param account_concurrency: int - Максимальное количество одновременных запросов одного продавца.
+    :param pool_size: int - Максимальное количество соединений в пуле.
+    :param pool_size_per_host: int - Максимальное количество соединений к одному хосту (0 - без ограничений).
+    :param dns_cache_ttl: int - Время жизни DNS кэша в секундах.
+    :param keepalive_timeout: float - Время удержания простаивающего соединения в секундах.
+    :param cache: BaseCache - Общее хранилище кэша. По умолчанию MemoryCache(cache_size).
+    :param cache_size: int - Максимальное количество записей в кэше по умолчанию.
+    :param item_cache: BaseCache - Общее хранилище кэша отдельных товаров. По умолчанию MemoryCache без ограничения размера.
+    :param codec: JsonCodec - Кодек JSON. По умолчанию orjson или msgspec, если установлены, иначе стандартный json.
+    :param metrics: MetricsSink - Приемник метрик запросов.
+    :param options: Остальные параметры OzonClient для всех продавцов.
+    """
+    def __init__(
+            self,
+            base_url: str = "https://api-seller.ozon.ru/",
+            locale: Literal["RU", "EN"] = "RU",
+            max_concurrency: int = 20,
+            account_concurrency: int = 10,
+            pool_size: int = 100,
+            pool_size_per_host: int = 0,
+            dns_cache_ttl: int = 300,
+            keepalive_timeout: float = 30,
+            cache: Optional[BaseCache] = None,
+            cache_size: int = 1024,
+            item_cache: Optional[BaseCache] = None,
+            codec: Optional[JsonCodec] = None,
+            metrics: Optional[MetricsSink] = None,
+            **options: Any
+    ):
+        self.base_url: str = base_url
+        self.locale: Literal["RU", "EN"] = locale
+        self.account_concurrency: int = account_concurrency
+        self.pool_size: int = pool_size
+        self.pool_size_per_host: int = pool_size_per_host
+        self.dns_cache_ttl: int = dns_cache_ttl
+        self.keepalive_timeout: float = keepalive_timeout
+        self.cache: BaseCache = cache if cache is not None else MemoryCache(cache_size)
+        self.item_cache: BaseCache = item_cache if item_cache is not None else MemoryCache(None)
+        self.codec: JsonCodec = codec if codec is not None else default_codec()
+        self.metrics: MetricsSink = metrics if metrics is not None else MetricsSink()
+        self.scheduler: FairScheduler = FairScheduler(max_concurrency)
+        self.options: Dict[str, Any] = options
+        self._clients: Dict[str, OzonClient] = {}
+        self._session: Optional[ClientSession] = None
+
+    async def __aenter__(self) -> "OzonClientManager":
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self) -> Iterator[OzonClient]:
+        return iter(list(self._clients.values()))
+
+    def __contains__(self, client_id: str) -> bool:
+        return str(client_id) in self._clients
+
+    def __getitem__(self, client_id: str) -> OzonClient:
+        return self._clients[str(client_id)]
+
+    def _get_session(self) -> ClientSession:
+        """
+        Возвращает общую сессию продавцов, создавая ее при необходимости.
+        """
+        if (self._session is None) or self._session.closed:
+            connector = TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.pool_size_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = ClientSession(base_url=self.base_url, connector=connector)
+        return self._session
+
+    def add(self, api_key: str, client_id: str, **options: Any) -> OzonClient:
+        """
+        Добавляет продавца. Чтобы заменить продавца, сначала удалите его через remove(): при удалении
+        отправляются накопленные им обновления остатков.
+
+        :param api_key: str - API ключ от OZON Seller.
+        :param client_id: str - Client Id от OZON Seller.
+        :param options: Параметры OzonClient этого продавца.
+
+        :return: OzonClient продавца.
+        :raises ClientExistsError: Если продавец с таким client_id уже добавлен.
+        """
+        if str(client_id) in self._clients:
+            raise ClientExistsError(str(client_id), self.locale)
+
+        client = OzonClient(
+            api_key,
+            client_id,
+            **{
+                "base_url": self.base_url,
+                "locale": self.locale,
+                "max_concurrency": self.account_concurrency,
+                "cache": self.cache,
+                "item_cache": self.item_cache,
+                "codec": self.codec,
+                "metrics": self.metrics,
+                **self.options,
+                **options,
+                "shared_session": self._get_session,
+                "scheduler": self.scheduler,
+            }
+        )
+        self._clients[client.cache_namespace] = client
+        return client
+
+    async def remove(self, client_id: str):
+        """
+        Удаляет продавца, предварительно отправив накопленные им обновления остатков.
+        """
+        client = self._clients.pop(str(client_id), None)
+        if client is not None:
+            await client.close()
+
+    async def close(self):
+        """
+        Закрывает клиенты всех продавцов и общую сессию.
+        """
+        await asyncio.gather(*(client.close() for client in self._clients.values()))
+
+        if (self._session is not None) and (not self._session.closed):
+            await self._session.close()
+        self._session = None
+
+    async def fan_out(
+            self,
+            func: Callable[[OzonClient], Awaitable[T]],
+            client_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, T]:
+        """
+        Вызывает func для клиентов продавцов одновременно.
+
+        :param func: Функция, принимающая OzonClient, например ``lambda client: client.stocks.get()``.
+        :param client_ids: Продавцы. Если не указаны - все.
+
+        :return: Результаты по client_id.
+        :raises BatchError: Если func завершилась ошибкой для части продавцов. BatchError.result содержит
+            результаты остальных, BatchError.errors - ошибки по client_id.
+        """
+        clients = [self._clients[str(client_id)] for client_id in client_ids] if client_ids is not None \
+            else list(self._clients.values())
+
+        results = await asyncio.gather(*(func(client) for client in clients), return_exceptions=True)
+
+        responses: Dict[str, T] = {}
+        errors: Dict[str, BaseException] = {}
+
+        for client, result in zip(clients, results):
+            if isinstance(result, BaseException):
+                errors[client.cache_namespace] = result
+            else:
+                responses[client.cache_namespace] = result
+
+        if errors:
+            raise BatchError(responses, errors, self.locale)
+
+        return responses
+
+    async def get_stocks(self, client_ids: Optional[Iterable[str]] = None, **kwargs: Any) -> Dict[str, StocksResponse]:
+        """
+        Возвращает остатки товаров на складах FBS и FBO всех продавцов.
+
+        :param client_ids: Продавцы. Если не указаны - все.
+        :param kwargs: Параметры OzonClient.stocks.get.
+        """
+        return await self.fan_out(lambda client: client.stocks.get(**kwargs), client_ids)
+
+    async def sync_stocks_fbs(
+            self,
+            client_ids: Optional[Iterable[str]] = None,
+            **kwargs: Any
+    ) -> Dict[str, StocksSyncResponse]:
+        """
+        Возвращает информацию о товарах и остатки на складах FBS всех продавцов.
+
+        :param client_ids: Продавцы. Если не указаны - все.
+        :param kwargs: Параметры OzonClient.sync.stocks_fbs.
+        """
+        return await self.fan_out(lambda client: client.sync.stocks_fbs(**kwargs), client_ids)
+
+    async def get_unfulfilled_list(
+            self,
+            status: Posting_Statuses,
+            cutoff_from: datetime,
+            cutoff_to: datetime,
+            client_ids: Optional[Iterable[str]] = None,
+            **kwargs: Any
+    ) -> Dict[str, PostingUnfulfilledResponse]:
+        """
+        Возвращает необработанные отправления всех продавцов.
+
+        :param client_ids: Продавцы. Если не указаны - все.
+        :param kwargs: Остальные параметры OzonClient.posting.get_unfulfilled_list.
+        """
+        return await self.fan_out(
+            lambda client: client.posting.get_unfulfilled_list(status, cutoff_from, cutoff_to, **kwargs), client_ids
+        )
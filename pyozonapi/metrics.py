@@ -0,0 +1,153 @@
+from bisect import bisect_left
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple
+)
+
+# Границы корзин гистограмм по умолчанию.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS: Tuple[float, ...] = tuple(float(256 * 4 ** power) for power in range(10))
+PAGES_BUCKETS: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Метрики клиентов: имя -> (тип, описание, границы корзин гистограммы).
+METRICS: Dict[str, Tuple[str, str, Optional[Tuple[float, ...]]]] = {
+    "ozon_requests_total": ("counter", "Ozon API requests by endpoint and HTTP status", None),
+    "ozon_request_seconds": ("histogram", "Ozon API request latency", LATENCY_BUCKETS),
+    "ozon_request_bytes": ("histogram", "Ozon API request body size", BYTES_BUCKETS),
+    "ozon_response_bytes": ("histogram", "Ozon API response body size", BYTES_BUCKETS),
+    "ozon_throttled_total": ("counter", "Ozon API rate limit responses (429, 999)", None),
+    "ozon_retries_total": ("counter", "Ozon API request retries", None),
+    "ozon_pages": ("histogram", "Pages fetched per pagination call", PAGES_BUCKETS),
+    "ozon_cache_items_total": ("counter", "Items served from the per-item cache (hit) or requested (miss)", None),
+    "ozon_push_events_total": ("counter", "Push notifications received by message type", None),
+    "ozon_push_duplicates_total": ("counter", "Redelivered push notifications acknowledged without handling", None),
+    "ozon_push_rejected_total": ("counter", "Push notifications rejected because the queue was full", None),
+    "ozon_push_handler_seconds": ("histogram", "Push handler latency by message type", LATENCY_BUCKETS),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsSink:
+    """
+    Приемник метрик OzonClient и OzonPushClient. Сам по себе ничего не сохраняет.
+
+    Для передачи метрик в свою систему мониторинга нужно переопределить increment и observe.
+    Имена метрик и их значения описаны в METRICS.
+    """
+
+    def increment(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0):
+        """
+        Увеличивает счетчик name на value.
+        """
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """
+        Добавляет значение value в гистограмму name.
+        """
+
+
+def _labels(labels: Optional[Dict[str, str]]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items())) if labels else ()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    items = labels + (extra,) if extra is not None else labels
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in items) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Хранит метрики в памяти и отдает их в текстовом формате Prometheus.
+
+    OzonPushClient с этим приемником отдает метрики по адресу metrics_path. Один приемник можно передать
+    и в OzonClient, и в OzonPushClient, чтобы все метрики процесса были на одной странице.
+
+    :param buckets: Границы корзин гистограмм {имя метрики: границы}. Для остальных гистограмм используются
+        границы из METRICS, для неизвестных - LATENCY_BUCKETS.
+    """
+    content_type: str = "text/plain; version=0.0.4"
+
+    def __init__(self, buckets: Optional[Dict[str, Sequence[float]]] = None):
+        self._buckets: Dict[str, Tuple[float, ...]] = {
+            name: buckets for name, (kind, _, buckets) in METRICS.items() if kind == "histogram"
+        }
+        self._buckets.update({name: tuple(sorted(bounds)) for name, bounds in (buckets or {}).items()})
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List]] = {}
+
+    def increment(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1.0):
+        series = self._counters.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        bounds = self._buckets.get(name, LATENCY_BUCKETS)
+        series = self._histograms.setdefault(name, {})
+        key = _labels(labels)
+        state = series.get(key)
+
+        if state is None:
+            # Количество в каждой корзине (последняя - +Inf), сумма и количество значений.
+            state = series[key] = [[0] * (len(bounds) + 1), 0.0, 0]
+
+        state[0][bisect_left(bounds, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def value(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        """
+        Возвращает значение счетчика или количество значений гистограммы. Если метрики нет - 0.
+        """
+        key = _labels(labels)
+        if name in self._histograms:
+            state = self._histograms[name].get(key)
+            return state[2] if state is not None else 0
+        return self._counters.get(name, {}).get(key, 0.0)
+
+    def reset(self):
+        """
+        Удаляет все накопленные значения.
+        """
+        self._counters.clear()
+        self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Возвращает все метрики в текстовом формате Prometheus.
+        """
+        lines: List[str] = []
+
+        for name, series in self._counters.items():
+            lines.append(f"# HELP {name} {METRICS.get(name, ('', name, None))[1]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in series.items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name, series in self._histograms.items():
+            bounds = self._buckets.get(name, LATENCY_BUCKETS)
+            lines.append(f"# HELP {name} {METRICS.get(name, ('', name, None))[1]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, (counts, total, count) in series.items():
+                cumulative = 0
+                for bound, bucket_count in zip(bounds + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', le))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
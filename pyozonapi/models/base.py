@@ -1,4 +1,23 @@
-from pydantic import BaseModel
+import gc
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
+from operator import attrgetter
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+    get_args,
+    get_origin
+)
+from pydantic import BaseModel, SerializerFunctionWrapHandler, TypeAdapter, model_serializer
+
+from ..types import Model_Modes
 
 
 class BaseResponse(BaseModel):
@@ -6,6 +25,7 @@ class BaseResponse(BaseModel):
     class Config:
         extra = 'allow'
         allow_mutation = False
+        defer_build = True
 
 
 class BasePushEvent(BaseModel):
@@ -15,3 +35,423 @@ class BasePushEvent(BaseModel):
     class Config:
         extra = 'allow'
         allow_mutation = False
+        defer_build = True
+
+
+class ListResponse(BaseModel):
+    """
+    Ответ со списками моделей из build_models. Перед сериализацией загружает все элементы списков LazyModels,
+    поэтому model_dump не зависит от того, к каким элементам уже обращались.
+    """
+
+    class Config:
+        defer_build = True
+
+    @model_serializer(mode='wrap')
+    def _serialize_loaded(self, handler: SerializerFunctionWrapHandler) -> Dict[str, Any]:
+        for value in self.__dict__.values():
+            if isinstance(value, LazyModels):
+                value.load()
+        return handler(self)
+
+
+class IndexedResponse(ListResponse):
+    """
+    Ответ со списком offers. Индексы by_* строятся при первом обращении и затем переиспользуются.
+
+    Поля offers можно получить колонками: to_columns - списками, to_numpy - массивами numpy,
+    to_arrow - таблицей pyarrow. Агрегации totals и where выполняются над массивами numpy без обхода offers.
+    numpy и pyarrow не входят в зависимости и нужны только для соответствующих методов.
+    """
+
+    offers: List[Any]
+
+    # Колонки: имя колонки -> путь к полю offer, например "fbs_quantity": "fbs.quantity".
+    COLUMNS: ClassVar[Dict[str, str]] = {}
+    # Вычисляемые колонки: имя колонки -> (уменьшаемое, вычитаемое), например "available": ("quantity", "reserve").
+    DIFFERENCES: ClassVar[Dict[str, Tuple[str, str]]] = {}
+    # Поля offers, по которым ответ входит в ключ ttl_cache, когда передается аргументом метода (например,
+    # ProductInfoResponse в Stocks.get_fbs). Методы, принимающие ответ, должны зависеть только от этих полей.
+    # Если не заданы, в ключ входит весь ответ.
+    KEY_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    class Config:
+        defer_build = True
+
+    @cached_property
+    def _arrays(self) -> Dict[str, Any]:
+        return {}
+
+    def _column_names(self, columns: Optional[Sequence[str]]) -> List[str]:
+        if columns is None:
+            return list(self.COLUMNS) + list(self.DIFFERENCES)
+        for name in columns:
+            if (name not in self.COLUMNS) and (name not in self.DIFFERENCES):
+                raise KeyError(f"Unknown column {name!r}, available: {', '.join(self._column_names(None))}")
+        return list(columns)
+
+    def _column(self, name: str) -> List[Any]:
+        if name in self.DIFFERENCES:
+            minuend, subtrahend = self.DIFFERENCES[name]
+            return [a - b for a, b in zip(self._column(minuend), self._column(subtrahend))]
+        return list(map(attrgetter(self.COLUMNS[name]), self.offers))
+
+    def _array(self, name: str) -> Any:
+        array = self._arrays.get(name)
+        if array is None:
+            import numpy
+
+            if name in self.DIFFERENCES:
+                minuend, subtrahend = self.DIFFERENCES[name]
+                array = self._array(minuend) - self._array(subtrahend)
+            else:
+                # Пустой список numpy считает float64, суммы остатков должны оставаться целыми.
+                array = numpy.array(self._column(name)) if self.offers else numpy.zeros(0, dtype=numpy.int64)
+            array.flags.writeable = False
+            self._arrays[name] = array
+        return array
+
+    def to_columns(self, columns: Optional[Sequence[str]] = None) -> Dict[str, List[Any]]:
+        """
+        Возвращает поля offers колонками.
+
+        :param columns: Sequence[str] - Имена колонок из COLUMNS и DIFFERENCES. Если не указаны - все.
+
+        :return: Списки значений по именам колонок в порядке offers.
+        """
+        return {name: self._column(name) for name in self._column_names(columns)}
+
+    def to_numpy(self, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Возвращает поля offers массивами numpy. Массивы только для чтения и строятся один раз на ответ.
+
+        :param columns: Sequence[str] - Имена колонок из COLUMNS и DIFFERENCES. Если не указаны - все.
+
+        :return: Массивы numpy.ndarray по именам колонок в порядке offers.
+        """
+        return {name: self._array(name) for name in self._column_names(columns)}
+
+    def to_arrow(self, columns: Optional[Sequence[str]] = None) -> Any:
+        """
+        Возвращает поля offers таблицей pyarrow.Table.
+
+        :param columns: Sequence[str] - Имена колонок из COLUMNS и DIFFERENCES. Если не указаны - все.
+        """
+        import pyarrow
+        return pyarrow.table(self.to_columns(columns))
+
+    def totals(self, columns: Sequence[str], by: Optional[str] = None) -> Dict[Any, Any]:
+        """
+        Суммирует числовые колонки.
+
+        :param columns: Sequence[str] - Колонки для суммирования.
+        :param by: str - Колонка группировки, например "warehouse_id". Если не указана - суммы по всем offers.
+
+        :return: Суммы по именам колонок, а с by - такие же суммы по значениям колонки группировки.
+        """
+        import numpy
+
+        columns = self._column_names(columns)
+        if by is None:
+            return {name: self._array(name).sum().item() for name in columns}
+
+        keys, inverse = numpy.unique(self._array(by), return_inverse=True)
+        sums = {
+            name: numpy.bincount(inverse, weights=self._array(name), minlength=len(keys)).astype(numpy.int64)
+            for name in columns
+        }
+        return {
+            key: {name: sums[name][position].item() for name in columns}
+            for position, key in enumerate(keys.tolist())
+        }
+
+    def where(
+            self,
+            column: str,
+            minimum: Optional[float] = None,
+            maximum: Optional[float] = None,
+            columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Отбирает offers, у которых значение колонки в заданных пределах (включительно).
+
+        :param column: str - Колонка условия.
+        :param minimum: float - Нижняя граница. Если не указана - без ограничения.
+        :param maximum: float - Верхняя граница. Если не указана - без ограничения.
+        :param columns: Sequence[str] - Колонки результата. Если не указаны - все.
+
+        :return: Массивы numpy.ndarray отобранных offers по именам колонок.
+        """
+        import numpy
+
+        values = self._array(self._column_names([column])[0])
+        mask = numpy.ones(len(values), dtype=bool)
+        if minimum is not None:
+            mask &= values >= minimum
+        if maximum is not None:
+            mask &= values <= maximum
+        return {name: self._array(name)[mask] for name in self._column_names(columns)}
+
+    def _fingerprint(self) -> Optional[List[Any]]:
+        """
+        Значения KEY_FIELDS всех offers для ключа кэша. Элементы LazyModels, к которым еще не обращались,
+        читаются из исходных словарей без валидации.
+        """
+        if not self.KEY_FIELDS:
+            return None
+
+        getter = attrgetter(*self.KEY_FIELDS)
+        if not isinstance(self.offers, LazyModels):
+            return list(map(getter, self.offers))
+
+        fields = self.offers._model.model_fields
+        aliases = [fields[name].alias or name for name in self.KEY_FIELDS]
+        values = []
+        for item in list.__iter__(self.offers):
+            if isinstance(item, dict):
+                values.append(item.get(aliases[0]) if len(aliases) == 1 else tuple(map(item.get, aliases)))
+            else:
+                values.append(getter(item))
+        return values
+
+    def _unique_index(self, *attributes: str) -> Dict[Any, Any]:
+        key = attrgetter(*attributes)
+        return {key(offer): offer for offer in self.offers}
+
+    def _group_index(self, attribute: str) -> Dict[Any, List[Any]]:
+        key = attrgetter(attribute)
+        index: Dict[Any, List[Any]] = {}
+        for offer in self.offers:
+            index.setdefault(key(offer), []).append(offer)
+        return index
+
+
+class LazyModels(list):
+    """
+    Список моделей, который валидирует элемент при первом обращении к нему.
+    До обращения элемент хранится в виде исходного словаря из ответа API.
+    """
+
+    def __init__(self, model: Type[BaseModel], items: List[Dict[str, Any]]):
+        super().__init__(items)
+        self._model = model
+
+    def _load(self, index: int) -> Any:
+        item = list.__getitem__(self, index)
+        if isinstance(item, dict):
+            item = self._model.model_validate(item)
+            list.__setitem__(self, index, item)
+        return item
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._load(i) for i in range(*index.indices(len(self)))]
+        return self._load(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._load(index)
+
+    def __reduce__(self):
+        return LazyModels, (self._model, list(list.__iter__(self)))
+
+    def load(self) -> "LazyModels":
+        """
+        Валидирует все элементы, к которым еще не обращались.
+        """
+        for index in range(len(self)):
+            self._load(index)
+        return self
+
+
+def _loading(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self: LazyModels, *args: Any, **kwargs: Any) -> Any:
+        self.load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+# Методы list, которые читают элементы в обход __getitem__ и __iter__.
+for _name in (
+        '__contains__', '__eq__', '__ne__', '__lt__', '__le__', '__gt__', '__ge__', '__reversed__',
+        '__add__', '__mul__', '__rmul__', 'copy', 'pop', 'index', 'count', 'remove', 'sort'
+):
+    setattr(LazyModels, _name, _loading(_name))
+del _name
+
+
+_setattr = object.__setattr__
+
+# Размер списка, начиная с которого сборка моделей идет с отключенным сборщиком циклического мусора.
+# По умолчанию (None) сборщик не отключается. Сборщик общий для всего процесса, поэтому включайте паузу,
+# только если приложение само не управляет gc в других потоках: models.base.GC_PAUSE_THRESHOLD = 1000.
+GC_PAUSE_THRESHOLD: Optional[int] = None
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+
+    origin = get_origin(annotation)
+    args = [arg for arg in get_args(annotation) if arg is not type(None)]
+
+    if (origin is list) and args:
+        model, _ = _nested_model(args[0])
+        return model, model is not None
+
+    if (origin is Union) and (len(args) == 1):
+        return _nested_model(args[0])
+
+    return None, False
+
+
+class CompactRecord:
+    """
+    Запись с __slots__ вместо модели pydantic. Хранит только поля, объявленные в модели, без валидации
+    и без дополнительных полей ответа. Поля читаются так же, как у модели: ``offer.stocks.quantity``.
+    """
+
+    __slots__ = ()
+
+    _model: Type[BaseModel]
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __reduce__(self):
+        return _compact_record, (self._model, tuple(getattr(self, name) for name in self.__slots__))
+
+    def model_dump(self, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Возвращает поля записи словарем, вложенные записи - тоже словарями.
+        """
+        values = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, CompactRecord):
+                value = value.model_dump()
+            elif isinstance(value, list):
+                value = [item.model_dump() if isinstance(item, CompactRecord) else item for item in value]
+            values[name] = value
+        return values
+
+
+class _CompactPlan:
+
+    __slots__ = ('record', 'prepare', 'fields')
+
+    def __init__(self, model: Type[BaseModel]):
+        self.record: Type[CompactRecord] = type(
+            f"{model.__name__}Record",
+            (CompactRecord,),
+            {
+                '__slots__': tuple(model.model_fields),
+                '__module__': model.__module__,
+                '__qualname__': f"{model.__qualname__}Record",
+                '_model': model,
+            }
+        )
+        self.prepare = getattr(model, '_prepare', None)
+        self.fields: List[Tuple[str, str, Optional[Type[BaseModel]], bool, Any]] = []
+
+        for name, field in model.model_fields.items():
+            nested, is_list = _nested_model(field.annotation)
+            default = None if field.is_required() else field.get_default(call_default_factory=True)
+            self.fields.append((name, field.alias or name, nested, is_list, default))
+
+
+_compact_plans: Dict[Type[BaseModel], _CompactPlan] = {}
+
+
+def _compact_plan(model: Type[BaseModel]) -> _CompactPlan:
+    plan = _compact_plans.get(model)
+    if plan is None:
+        plan = _compact_plans[model] = _CompactPlan(model)
+    return plan
+
+
+def _compact_record(model: Type[BaseModel], values: Tuple[Any, ...]) -> CompactRecord:
+    record_type = _compact_plan(model).record
+    record = record_type.__new__(record_type)
+    for name, value in zip(record_type.__slots__, values):
+        _setattr(record, name, value)
+    return record
+
+
+def compact_model(model: Type[BaseModel], data: Dict[str, Any]) -> CompactRecord:
+    """
+    Создает CompactRecord модели и вложенные записи без валидации. Подходит только для доверенных ответов API.
+    Поля, которых нет в ответе, получают значение по умолчанию из модели или None.
+    """
+    plan = _compact_plan(model)
+
+    if plan.prepare is not None:
+        data = plan.prepare(data)
+
+    record = plan.record.__new__(plan.record)
+
+    for name, key, nested, is_list, default in plan.fields:
+        value = data.get(key, default)
+        if (nested is not None) and (value is not None):
+            value = [compact_model(nested, item) for item in value] if is_list else compact_model(nested, value)
+        _setattr(record, name, value)
+
+    return record
+
+
+@contextmanager
+def _gc_paused(size: int):
+    # Создание сотен тысяч объектов запускает сборщик циклического мусора на каждой тысяче аллокаций,
+    # хотя модели ответа не образуют циклов. Если задан GC_PAUSE_THRESHOLD, на время сборки большого списка
+    # сборщик отключается.
+    if (GC_PAUSE_THRESHOLD is None) or (size < GC_PAUSE_THRESHOLD) or (not gc.isenabled()):
+        yield
+        return
+
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
+
+
+def build_models(model: Type[BaseModel], items: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> List[Any]:
+    """
+    Создает модели из элементов ответа API.
+
+    :param model: Type[BaseModel] - Модель элемента.
+    :param items: List[dict] - Элементы ответа API.
+    :param mode: Model_Modes - "validate" - валидация каждого элемента отдельно,
+        "bulk" - валидация всего списка за один вызов через общий TypeAdapter,
+        "lazy" - валидация элемента при первом обращении к нему,
+        "compact" - без валидации в записи CompactRecord с __slots__, хранящие только объявленные поля.
+            Занимают в несколько раз меньше памяти, чем модели, подходит для очень больших каталогов.
+            Значения не преобразуются: например, даты остаются строками.
+
+    Код, которому нужны типизированные значения (например, datetime), должен запрашивать "bulk" или "validate"
+    независимо от режима клиента, как PostingStore.
+    """
+    if mode == "bulk":
+        with _gc_paused(len(items)):
+            return _list_adapter(model).validate_python(items)
+    if mode == "lazy":
+        return LazyModels(model, items)
+    if mode == "compact":
+        with _gc_paused(len(items)):
+            return [compact_model(model, item) for item in items]
+    return [model.model_validate(item) for item in items]
@@ -1,22 +1,26 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import (
     List,
     Dict,
+    Optional,
     Any
 )
-from .base import BaseResponse
+from .base import BaseResponse, ListResponse, build_models
 from ..types import (
+    Model_Modes,
     Posting_Statuses,
     Posting_SubStatuses
 )
 
 
-class PostingUnfulfilledResponse(BaseModel):
+class PostingUnfulfilledResponse(ListResponse):
     """
     Модель ответа OzonClient.posting.get_unfulfilled_list
 
     :param postings: dict - json ответ от API на v3/posting/fbs/unfulfilled/list.
     :param locale: "RU" | "EN" - Язык ответов.
+    :param mode: Model_Modes - Способ создания моделей, см. models.base.build_models.
     """
 
     class Order(BaseResponse):
@@ -28,16 +32,44 @@ class PostingUnfulfilledResponse(BaseModel):
             quantity: int
             name: str
 
+        class DeliveryMethod(BaseResponse):
+
+            warehouse_id: int
+
         id: int = Field(alias='order_id')
         number: str = Field(alias='order_number')
         offers: List[Offer] = Field(alias='products')
         posting_number: str
         status: Posting_Statuses
         substatus: Posting_SubStatuses
+        delivery_method: Optional[DeliveryMethod] = None
+        shipment_date: Optional[datetime] = None
 
     orders: List[Order]
 
     @classmethod
-    def from_response(cls, response: List[Dict[str, Any]]) -> "PostingUnfulfilledResponse":
-        orders = [cls.Order(**order) for order in response]
-        return cls(orders=orders)
+    def from_response(cls, response: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> "PostingUnfulfilledResponse":
+        return cls.model_construct(orders=build_models(cls.Order, response, mode))
+
+
+class PostingState(BaseModel):
+    """
+    Состояние отправления в PostingStore
+
+    posting_number - Номер отправления \n
+    status - Статус отправления \n
+    substatus - Подстатус отправления \n
+    warehouse_id - ID склада FBS \n
+    cutoff - Время, до которого нужно собрать заказ \n
+    products - Количество товара по SKU
+    """
+
+    posting_number: str
+    status: str
+    substatus: Optional[str] = None
+    warehouse_id: Optional[int] = None
+    cutoff: Optional[datetime] = None
+    products: Dict[int, int] = {}
+
+    class Config:
+        defer_build = True
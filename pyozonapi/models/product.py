@@ -1,18 +1,23 @@
-from pydantic import BaseModel, Field
+from functools import cached_property
+from pydantic import Field
 from typing import (
     List,
     Dict,
+    Optional,
+    Sequence,
     Any
 )
-from .base import BaseResponse
+from .base import BaseResponse, IndexedResponse, build_models
+from ..types import Model_Modes
 
 
-class ProductListResponse(BaseModel):
+class ProductListResponse(IndexedResponse):
     """
     Модель ответа OzonClient.product.get_list
 
     :param products: dict - json ответ от API на v2/product/list.
     :param locale: "RU" | "EN" - Язык ответов.
+    :param mode: Model_Modes - Способ создания моделей, см. models.base.build_models.
     """
 
     class Offer(BaseResponse):
@@ -22,18 +27,28 @@ class ProductListResponse(BaseModel):
 
     offers: List[Offer]
 
+    KEY_FIELDS = ("id",)
+
+    @cached_property
+    def by_offer_id(self) -> Dict[str, Offer]:
+        return self._unique_index('id')
+
+    @cached_property
+    def by_product_id(self) -> Dict[int, Offer]:
+        return self._unique_index('product_id')
+
     @classmethod
-    def from_response(cls, response: List[Dict[str, Any]]) -> "ProductListResponse":
-        offers = [cls.Offer(**offer) for offer in response]
-        return cls(offers=offers)
+    def from_response(cls, response: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> "ProductListResponse":
+        return cls.model_construct(offers=build_models(cls.Offer, response, mode))
 
 
-class ProductInfoResponse(BaseModel):
+class ProductInfoResponse(IndexedResponse):
     """
     Модель ответа OzonClient.product.get_info
 
     :param products: dict - json ответ от API на v2/product/info/list.
     :param locale: "RU" | "EN" - Язык ответов.
+    :param mode: Model_Modes - Способ создания моделей, см. models.base.build_models.
     """
 
     class Offer(BaseResponse):
@@ -63,7 +78,45 @@ class ProductInfoResponse(BaseModel):
 
     offers: List[Offer]
 
+    COLUMNS = {
+        "id": "id",
+        "product_id": "product_id",
+        "sku": "sku",
+        "is_archived": "is_archived",
+        "visible": "visible",
+        "quantity": "stocks.quantity",
+        "reserve": "stocks.reserve",
+        "coming": "stocks.coming",
+        "discounted_quantity": "discounted_stocks.quantity",
+        "discounted_reserve": "discounted_stocks.reserve",
+    }
+    DIFFERENCES = {
+        "available": ("quantity", "reserve"),
+        "discounted_available": ("discounted_quantity", "discounted_reserve"),
+    }
+    KEY_FIELDS = ("id", "sku")
+
+    @cached_property
+    def by_offer_id(self) -> Dict[str, Offer]:
+        return self._unique_index('id')
+
+    @cached_property
+    def by_sku(self) -> Dict[int, Offer]:
+        return self._unique_index('sku')
+
+    @cached_property
+    def by_product_id(self) -> Dict[int, Offer]:
+        return self._unique_index('product_id')
+
+    def low_stock(self, threshold: int = 0, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Возвращает товары, доступный остаток которых (с учетом резервов) не больше threshold. Требует numpy.
+
+        :param threshold: int - Порог доступного остатка.
+        :param columns: Sequence[str] - Колонки результата. Если не указаны - все.
+        """
+        return self.where("available", maximum=threshold, columns=columns)
+
     @classmethod
-    def from_response(cls, response: List[Dict[str, Any]]) -> "ProductInfoResponse":
-        offers = [cls.Offer(**offer) for offer in response]
-        return cls(offers=offers)
+    def from_response(cls, response: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> "ProductInfoResponse":
+        return cls.model_construct(offers=build_models(cls.Offer, response, mode))
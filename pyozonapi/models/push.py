@@ -1,7 +1,10 @@
-from pydantic import BaseModel, field_validator
+from functools import lru_cache
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 from typing import (
+    Annotated,
     Literal,
-    List
+    List,
+    Union
 )
 from .base import (
     BaseResponse,
@@ -73,3 +76,36 @@ class PushStateChanged(BasePushEvent):
             value = value.replace('Z', '+00:00')
             return datetime.fromisoformat(value)
         return value
+
+
+PushEvent = Annotated[
+    Union[
+        PushNewPosting,
+        PushPostingCancelled,
+        PushStateChanged,
+    ],
+    Field(discriminator='message_type')
+]
+
+@lru_cache(maxsize=None)
+def push_event_adapter() -> TypeAdapter:
+    """
+    Возвращает схему разбора уведомлений. Схема собирается при первом уведомлении, разбор - один проход
+    по message_type.
+    """
+    return TypeAdapter(PushEvent)
+
+PUSH_EVENT_TYPES = frozenset({
+    "TYPE_NEW_POSTING",
+    "TYPE_POSTING_CANCELLED",
+    "TYPE_STATE_CHANGED",
+})
+
+
+def parse_push_event(data: dict) -> BasePushEvent:
+    """
+    Создает модель уведомления по полю message_type. Неизвестные типы возвращаются как BasePushEvent.
+    """
+    if data.get('message_type') in PUSH_EVENT_TYPES:
+        return push_event_adapter().validate_python(data)
+    return BasePushEvent(**data)
@@ -1,18 +1,26 @@
-from pydantic import BaseModel, Field
+from functools import cached_property
+from pydantic import BaseModel, Field, model_validator
 from typing import (
     List,
     Dict,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
     Any
 )
-from .base import BaseResponse
+from .base import BaseResponse, IndexedResponse, build_models
+from .product import ProductInfoResponse
+from ..types import Model_Modes
 
 
-class StocksResponse(BaseModel):
+class StocksResponse(IndexedResponse):
     """
     Модель ответа OzonClient.stocks.get
 
     :param stocks: dict - json ответ от API на v3/product/info/stocks.
     :param locale: "RU" | "EN" - Язык ответов.
+    :param mode: Model_Modes - Способ создания моделей, см. models.base.build_models.
     """
 
     class Offer(BaseResponse):
@@ -26,26 +34,87 @@ class StocksResponse(BaseModel):
         fbs: StocksType
         fbo: StocksType
 
+        @classmethod
+        def _prepare(cls, data: Any) -> Any:
+            if (not isinstance(data, dict)) or ('stocks' not in data):
+                return data
+            prepared = {key: value for key, value in data.items() if key != 'stocks'}
+            for item in data['stocks']:
+                prepared[item['type']] = item
+            return prepared
+
+        @model_validator(mode='before')
+        @classmethod
+        def _split_stocks(cls, data: Any) -> Any:
+            return cls._prepare(data)
+
         @classmethod
         def from_response(cls, response: Dict[str, Any]) -> "StocksResponse.Offer":
-            fbs = next((item for item in response['stocks'] if item['type'] == 'fbs'), None)
-            fbo = next((item for item in response['stocks'] if item['type'] == 'fbo'), None)
-            return cls(fbs=fbs, fbo=fbo, **(response.pop('stocks', response)))
+            return cls.model_validate(response)
 
     offers: List[Offer]
 
+    COLUMNS = {
+        "id": "id",
+        "product_id": "product_id",
+        "fbs_quantity": "fbs.quantity",
+        "fbs_reserve": "fbs.reserve",
+        "fbo_quantity": "fbo.quantity",
+        "fbo_reserve": "fbo.reserve",
+    }
+    DIFFERENCES = {
+        "fbs_available": ("fbs_quantity", "fbs_reserve"),
+        "fbo_available": ("fbo_quantity", "fbo_reserve"),
+    }
+
+    @cached_property
+    def by_offer_id(self) -> Dict[str, Offer]:
+        return self._unique_index('id')
+
+    @cached_property
+    def by_product_id(self) -> Dict[int, Offer]:
+        return self._unique_index('product_id')
+
+    def fbs_fbo_totals(self) -> Dict[str, Dict[str, int]]:
+        """
+        Возвращает суммарные остатки на складах FBS и FBO. Требует numpy.
+
+        :return: {"fbs": {"quantity", "reserve", "available"}, "fbo": {...}}
+        """
+        names = ("quantity", "reserve", "available")
+        totals = self.totals([f"{stock_type}_{name}" for stock_type in ("fbs", "fbo") for name in names])
+        return {
+            stock_type: {name: totals[f"{stock_type}_{name}"] for name in names}
+            for stock_type in ("fbs", "fbo")
+        }
+
+    def low_stock(
+            self,
+            threshold: int = 0,
+            stock_type: Literal["fbs", "fbo"] = "fbs",
+            columns: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Возвращает товары, доступный остаток которых (с учетом резервов) не больше threshold. Требует numpy.
+
+        :param threshold: int - Порог доступного остатка.
+        :param stock_type: "fbs" | "fbo" - Тип склада.
+        :param columns: Sequence[str] - Колонки результата. Если не указаны - все.
+        """
+        return self.where(f"{stock_type}_available", maximum=threshold, columns=columns)
+
     @classmethod
-    def from_response(cls, response: List[Dict[str, Any]]) -> "StocksResponse":
-        offers = [cls.Offer.from_response(offer) for offer in response]
-        return cls(offers=offers)
+    def from_response(cls, response: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> "StocksResponse":
+        return cls.model_construct(offers=build_models(cls.Offer, response, mode))
 
 
-class StocksResponseFBS(BaseModel):
+class StocksResponseFBS(IndexedResponse):
     """
     Модель ответа OzonClient.stocks.get_fbs
 
     :param stocks: dict - json ответ от API на v1/product/info/stocks-by-warehouse/fbs.
     :param locale: "RU" | "EN" - Язык ответов.
+    :param mode: Model_Modes - Способ создания моделей, см. models.base.build_models.
     """
 
     class Offer(BaseResponse):
@@ -60,18 +129,84 @@ class StocksResponseFBS(BaseModel):
 
     offers: List[Offer]
 
+    COLUMNS = {
+        "id": "id",
+        "sku": "sku",
+        "product_id": "product_id",
+        "warehouse_id": "warehouse_id",
+        "warehouse_name": "warehouse_name",
+        "quantity": "quantity",
+        "reserve": "reserve",
+    }
+    DIFFERENCES = {
+        "available": ("quantity", "reserve"),
+    }
+
+    @cached_property
+    def by_offer_id(self) -> Dict[str, List[Offer]]:
+        return self._group_index('id')
+
+    @cached_property
+    def by_sku(self) -> Dict[int, List[Offer]]:
+        return self._group_index('sku')
+
+    @cached_property
+    def by_product_id(self) -> Dict[int, List[Offer]]:
+        return self._group_index('product_id')
+
+    @cached_property
+    def by_warehouse(self) -> Dict[int, List[Offer]]:
+        return self._group_index('warehouse_id')
+
+    @cached_property
+    def by_offer_warehouse(self) -> Dict[Tuple[str, int], Offer]:
+        return self._unique_index('id', 'warehouse_id')
+
+    def warehouse_totals(self) -> Dict[int, Dict[str, int]]:
+        """
+        Возвращает суммарные остатки по складам. Требует numpy.
+
+        :return: {warehouse_id: {"quantity", "reserve", "available"}}
+        """
+        return self.totals(("quantity", "reserve", "available"), by="warehouse_id")
+
+    def low_stock(self, threshold: int = 0, columns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Возвращает остатки на складах, доступное количество которых (с учетом резервов) не больше threshold.
+        Требует numpy.
+
+        :param threshold: int - Порог доступного остатка.
+        :param columns: Sequence[str] - Колонки результата. Если не указаны - все.
+        """
+        return self.where("available", maximum=threshold, columns=columns)
+
     @classmethod
-    def from_response(cls, response: List[Dict[str, Any]]) -> "StocksResponseFBS":
-        offers = [cls.Offer(**offer) for offer in response]
-        return cls(offers=offers)
+    def from_response(cls, response: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> "StocksResponseFBS":
+        return cls.model_construct(offers=build_models(cls.Offer, response, mode))
+
+
+class StocksSyncResponse(BaseModel):
+    """
+    Модель ответа OzonClient.sync.stocks_fbs
+
+    products - Информация о товарах, как в OzonClient.product.get_info \n
+    stocks - Остатки на складах FBS, как в OzonClient.stocks.get_fbs
+    """
+
+    products: ProductInfoResponse
+    stocks: StocksResponseFBS
 
+    class Config:
+        defer_build = True
 
-class StocksUpdateResponse(BaseModel):
+
+class StocksUpdateResponse(IndexedResponse):
     """
         Модель ответа OzonClient.stocks.update
 
         :param updates: dict - json запрос.
         :param locale: "RU" | "EN" - Язык ответов.
+        :param mode: Model_Modes - Способ создания моделей, см. models.base.build_models.
     """
 
     class Offer(BaseResponse):
@@ -84,10 +219,13 @@ class StocksUpdateResponse(BaseModel):
 
     offers: List[Offer]
 
+    @cached_property
+    def by_offer_warehouse(self) -> Dict[Tuple[str, int], Offer]:
+        return self._unique_index('id', 'warehouse_id')
+
     @classmethod
-    def from_response(cls, response: List[Dict[str, Any]]) -> "StocksUpdateResponse":
-        offers = [cls.Offer(**offer) for offer in response]
-        return cls(offers=offers)
+    def from_response(cls, response: List[Dict[str, Any]], mode: Model_Modes = "bulk") -> "StocksUpdateResponse":
+        return cls.model_construct(offers=build_models(cls.Offer, response, mode))
 
 
 class StocksUpdateParams(BaseModel):
@@ -102,3 +240,6 @@ class StocksUpdateParams(BaseModel):
     product_id: int
     stock: int
     warehouse_id: int
+
+    class Config:
+        defer_build = True
@@ -1,10 +1,19 @@
-from typing import Optional
-
-from ..client import (
-    OzonClient
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Optional,
+    List,
+    Dict,
+    Set,
+    Tuple
 )
 
+if TYPE_CHECKING:
+    from ..client import OzonClient
+
 from ..types import (
+    Model_Modes,
     Posting_Statuses
 )
 
@@ -12,15 +21,19 @@ from ..exceptions.params import (
     ParamLimitError
 )
 
+from ..exceptions.api import BatchError
+
 from ..models.posting import PostingUnfulfilledResponse
 
+from ..modules.tools import gather_chunks
+
 from datetime import datetime
 
 class Posting:
     """
     Модули для работы с поставками и заказами
     """
-    def __init__(self, client: OzonClient):
+    def __init__(self, client: "OzonClient"):
         self._client = client
 
     async def get_unfulfilled_list(
@@ -30,49 +43,217 @@ class Posting:
             cutoff_to: datetime,
             limit: Optional[int] = None,
             reverse: bool = False,
-            wait: bool = True
+            wait: bool = True,
+            parallel: bool = False,
+            shards: int = 1,
+            concurrency: Optional[int] = None,
+            mode: Optional[Model_Modes] = None
     ) -> PostingUnfulfilledResponse:
         """
         Возвращает список необработанных отправлений.
 
+        При parallel=True первая страница запрашивается отдельно, а остальные - одновременно по общему количеству
+        отправлений из ее ответа. При shards > 1 период cutoff_from..cutoff_to делится на shards равных частей,
+        которые запрашиваются одновременно. Отправления, попавшие в несколько страниц или частей периода,
+        возвращаются один раз.
+
         :param status: Posting_Statuses - статус отправления.
         :param cutoff_from: Datetime - Фильтр по времени, до которого продавцу нужно собрать заказ. Начало периода.
         :param cutoff_to: Datetime - Фильтр по времени, до которого продавцу нужно собрать заказ. Конец периода.
         :param reverse: Bool - Получить ответ с обратной сортировкой.
         :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
         :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param parallel: Bool - Запрашивать страницы одновременно.
+        :param shards: Int > 0 - Количество частей периода. Если больше 1, страницы также запрашиваются одновременно.
+        :param concurrency: Int > 0 - Количество одновременно запрашиваемых страниц одной части периода. По умолчанию OzonClient.chunk_concurrency.
+        :param mode: Model_Modes - Способ создания моделей ответа. По умолчанию OzonClient.model_mode. В режиме "compact" shipment_date остается строкой.
 
         :return: PostingUnfulfilledResponse
+        :raises BatchError: Если часть страниц не получена. BatchError.result содержит ответ по полученным страницам.
         """
-        if limit <= 0:
+        if (not parallel) and (shards <= 1):
+            postings = [
+                posting
+                async for postings in self._iter_unfulfilled_pages(status, cutoff_from, cutoff_to, limit, reverse, wait)
+                for posting in postings
+            ]
+            return PostingUnfulfilledResponse.from_response(postings, mode or self._client.model_mode)
+
+        if (limit is not None) and (limit <= 0):
             raise ParamLimitError(self._client.locale)
 
+        windows = self._split_window(cutoff_from, cutoff_to, shards)
+        if reverse:
+            windows.reverse()
+
+        results = await asyncio.gather(*(
+            self._get_unfulfilled_window(status, window_from, window_to, limit, reverse, wait,
+                                         concurrency or self._client.chunk_concurrency)
+            for window_from, window_to in windows
+        ), return_exceptions=True)
+
+        postings: List[dict] = []
+        seen: Set[str] = set()
+        errors: Dict[int, BaseException] = {}
+
+        for result in results:
+            if isinstance(result, BaseException):
+                errors[len(errors)] = result
+                continue
+
+            window_postings, window_errors = result
+            for posting in window_postings:
+                if posting["posting_number"] not in seen:
+                    seen.add(posting["posting_number"])
+                    postings.append(posting)
+            for error in window_errors.values():
+                errors[len(errors)] = error
+
+        if limit is not None:
+            postings = postings[:limit]
+
+        response = PostingUnfulfilledResponse.from_response(postings, mode or self._client.model_mode)
+
+        if errors:
+            raise BatchError(response, errors, self._client.locale)
+
+        return response
+
+    @staticmethod
+    def _split_window(cutoff_from: datetime, cutoff_to: datetime, shards: int) -> List[Tuple[datetime, datetime]]:
+        """
+        Делит период на shards равных частей. Соседние части имеют общую границу.
+        """
+        shards = max(1, shards)
+        step = (cutoff_to - cutoff_from) / shards
+        bounds = [cutoff_from + step * index for index in range(shards)] + [cutoff_to]
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    async def _get_unfulfilled_window(
+            self,
+            status: Posting_Statuses,
+            cutoff_from: datetime,
+            cutoff_to: datetime,
+            limit: Optional[int],
+            reverse: bool,
+            wait: bool,
+            concurrency: int
+    ) -> Tuple[List[dict], Dict[int, BaseException]]:
+        """
+        Запрашивает первую страницу, затем остальные страницы периода одновременно.
+
+        :return: Отправления в порядке страниц и ошибки по номерам страниц.
+        """
         MAX_LIMIT = 1000
-        postings = []
-
-        while True:
-            body = {
-                "dir": "DESC" if reverse else "ASC",
-                "filter": {
-                    "cutoff_from": cutoff_from.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "cutoff_to": cutoff_to.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "status": status,
-                },
-                "limit": min(MAX_LIMIT, limit - len(postings)) if limit is not None else MAX_LIMIT,
-                "offset": len(postings),
-                "with": {
-                    "analytics_data": True,
-                    "barcodes": True,
-                    "financial_data": True,
-                    "translit": True
-                }
-            }
 
-            data = await self._client.fetch('post', 'v3/posting/fbs/unfulfilled/list', wait=wait, time=60, json=body)
+        body = self._unfulfilled_body(status, cutoff_from, cutoff_to, 0, min(MAX_LIMIT, limit or MAX_LIMIT), reverse)
+        data = await self._client.fetch('post', 'v3/posting/fbs/unfulfilled/list', wait=wait, time=60, json=body)
+
+        postings = data["result"]["postings"]
+        total = data["result"]["count"] if limit is None else min(limit, data["result"]["count"])
+
+        if len(postings) < body["limit"]:
+            self._client.metrics.observe("ozon_pages", 1, {"endpoint": "v3/posting/fbs/unfulfilled/list"})
+            return postings, {}
+
+        offsets = list(range(len(postings), total, MAX_LIMIT))
+
+        async def get_page(offset: int) -> List[dict]:
+            page_body = self._unfulfilled_body(status, cutoff_from, cutoff_to, offset, min(MAX_LIMIT, total - offset), reverse)
+            page = await self._client.fetch('post', 'v3/posting/fbs/unfulfilled/list', wait=wait, time=60, json=page_body)
+            return page["result"]["postings"]
+
+        results, errors = await gather_chunks(offsets, get_page, concurrency)
+        self._client.metrics.observe("ozon_pages", 1 + len(offsets) - len(errors), {"endpoint": "v3/posting/fbs/unfulfilled/list"})
+
+        return postings + [posting for result in results if result is not None for posting in result], errors
+
+    async def iter_unfulfilled_list(
+            self,
+            status: Posting_Statuses,
+            cutoff_from: datetime,
+            cutoff_to: datetime,
+            limit: Optional[int] = None,
+            reverse: bool = False,
+            wait: bool = True,
+            mode: Optional[Model_Modes] = None
+    ) -> AsyncIterator[PostingUnfulfilledResponse.Order]:
+        """
+        Возвращает необработанные отправления по мере получения страниц, не накапливая весь список в памяти.
+
+        :param status: Posting_Statuses - статус отправления.
+        :param cutoff_from: Datetime - Фильтр по времени, до которого продавцу нужно собрать заказ. Начало периода.
+        :param cutoff_to: Datetime - Фильтр по времени, до которого продавцу нужно собрать заказ. Конец периода.
+        :param reverse: Bool - Получить ответ с обратной сортировкой.
+        :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
+        :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param mode: Model_Modes - Способ создания моделей ответа. По умолчанию OzonClient.model_mode. В режиме "compact" shipment_date остается строкой.
+
+        :return: AsyncIterator[PostingUnfulfilledResponse.Order]
+        """
+        async for postings in self._iter_unfulfilled_pages(status, cutoff_from, cutoff_to, limit, reverse, wait):
+            for order in PostingUnfulfilledResponse.from_response(postings, mode or self._client.model_mode).orders:
+                yield order
+
+    async def _iter_unfulfilled_pages(
+            self,
+            status: Posting_Statuses,
+            cutoff_from: datetime,
+            cutoff_to: datetime,
+            limit: Optional[int] = None,
+            reverse: bool = False,
+            wait: bool = True
+    ) -> AsyncIterator[List[dict]]:
+        if (limit is not None) and (limit <= 0):
+            raise ParamLimitError(self._client.locale)
 
-            postings.extend(data["result"]["postings"])
+        MAX_LIMIT = 1000
+        received = 0
+        pages = 0
 
-            if (body["limit"] < MAX_LIMIT) or (data["result"]["count"] < body["limit"]) or (len(postings) >= limit):
-                break
+        try:
+            while True:
+                body = self._unfulfilled_body(
+                    status, cutoff_from, cutoff_to, received,
+                    min(MAX_LIMIT, limit - received) if limit is not None else MAX_LIMIT, reverse
+                )
 
-        return PostingUnfulfilledResponse.from_response(postings)
+                data = await self._client.fetch('post', 'v3/posting/fbs/unfulfilled/list', wait=wait, time=60, json=body)
+                pages += 1
+
+                postings = data["result"]["postings"]
+                received += len(postings)
+
+                yield postings
+
+                if ((body["limit"] < MAX_LIMIT) or (len(postings) < body["limit"]) or (data["result"]["count"] < body["limit"])
+                        or ((limit is not None) and (received >= limit))):
+                    break
+        finally:
+            self._client.metrics.observe("ozon_pages", pages, {"endpoint": "v3/posting/fbs/unfulfilled/list"})
+
+    @staticmethod
+    def _unfulfilled_body(
+            status: Posting_Statuses,
+            cutoff_from: datetime,
+            cutoff_to: datetime,
+            offset: int,
+            limit: int,
+            reverse: bool
+    ) -> dict:
+        return {
+            "dir": "DESC" if reverse else "ASC",
+            "filter": {
+                "cutoff_from": cutoff_from.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "cutoff_to": cutoff_to.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "status": status,
+            },
+            "limit": limit,
+            "offset": offset,
+            "with": {
+                "analytics_data": True,
+                "barcodes": True,
+                "financial_data": True,
+                "translit": True
+            }
+        }
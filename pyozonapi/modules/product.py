@@ -1,30 +1,35 @@
 from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    Iterable,
     Optional,
     List
 )
 
-from ..client import (
-    OzonClient
-)
+if TYPE_CHECKING:
+    from ..client import OzonClient
 
 from ..exceptions.params import (
     ParamLimitError
 )
+from ..exceptions.api import BatchError
 
 from ..models.product import (
     ProductListResponse,
     ProductInfoResponse
 )
 
-from ..types import Info_Statuses
+from ..types import Info_Statuses, Model_Modes
 from ..modules.tools import list_division
+from ..modules.tools import gather_chunks
 from ..modules.tools import ttl_cache
 
 class Product:
     """
     Модули для работы с товарами
     """
-    def __init__(self, client: OzonClient):
+    def __init__(self, client: "OzonClient"):
         self._client = client
 
     @ttl_cache
@@ -32,7 +37,8 @@ class Product:
             self,
             status: Info_Statuses = "ALL",
             limit: Optional[int] = None,
-            wait: bool = True
+            wait: bool = True,
+            mode: Optional[Model_Modes] = None
     ) -> ProductListResponse:
         """
         Возвращает список товаров.
@@ -40,63 +46,182 @@ class Product:
         :param status: Str - Статус видимости товара.
         :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
         :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param mode: Model_Modes - Способ создания моделей ответа, например "compact" для очень больших каталогов. По умолчанию OzonClient.model_mode.
 
         :return: ProductListResponse
         """
+        products = [item async for items in self._iter_list_pages(status, limit, wait) for item in items]
+        return ProductListResponse.from_response(products, mode or self._client.model_mode)
+
+    async def iter_list(
+            self,
+            status: Info_Statuses = "ALL",
+            limit: Optional[int] = None,
+            wait: bool = True,
+            mode: Optional[Model_Modes] = None
+    ) -> AsyncIterator[ProductListResponse.Offer]:
+        """
+        Возвращает товары по мере получения страниц, не накапливая весь список в памяти.
 
-        if limit <= 0:
+        :param status: Str - Статус видимости товара.
+        :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
+        :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param mode: Model_Modes - Способ создания моделей ответа, например "compact" для очень больших каталогов. По умолчанию OzonClient.model_mode.
+
+        :return: AsyncIterator[ProductListResponse.Offer]
+        """
+
+        async for items in self._iter_list_pages(status, limit, wait):
+            for offer in ProductListResponse.from_response(items, mode or self._client.model_mode).offers:
+                yield offer
+
+    async def _iter_list_pages(
+            self,
+            status: Info_Statuses = "ALL",
+            limit: Optional[int] = None,
+            wait: bool = True
+    ) -> AsyncIterator[List[dict]]:
+        if (limit is not None) and (limit <= 0):
             raise ParamLimitError(self._client.locale)
 
         MAX_LIMIT = 1000
         last_id = ''
-        products = []
+        received = 0
+        pages = 0
 
-        while True:
+        try:
+            while True:
 
-            body = {
-                "filter": {
-                    "visibility": status,
-                },
-                "last_id": last_id,
-                "limit": min(MAX_LIMIT, limit - len(products)) if limit is not None else MAX_LIMIT
-            }
+                body = {
+                    "filter": {
+                        "visibility": status,
+                    },
+                    "last_id": last_id,
+                    "limit": min(MAX_LIMIT, limit - received) if limit is not None else MAX_LIMIT
+                }
 
-            data = await self._client.fetch('post', 'v2/product/list', wait=wait, time=60, json=body)
+                data = await self._client.fetch('post', 'v2/product/list', wait=wait, time=60, json=body)
+                pages += 1
 
-            products.extend(data["result"]["items"])
+                items = data["result"]["items"]
+                received += len(items)
 
-            if (body["limit"] < MAX_LIMIT) or (data["result"]["total"] < body["limit"]) or (len(products) >= limit):
-                break
+                yield items
 
-            last_id = data["result"]["last_id"]
+                if ((body["limit"] < MAX_LIMIT) or (len(items) < body["limit"]) or (data["result"]["total"] < body["limit"])
+                        or ((limit is not None) and (received >= limit))):
+                    break
 
-        return ProductListResponse.from_response(products)
+                last_id = data["result"]["last_id"]
+        finally:
+            self._client.metrics.observe("ozon_pages", pages, {"endpoint": "v2/product/list"})
 
     @ttl_cache
-    async def get_info(self, product_list: ProductListResponse, wait: bool = True) -> ProductInfoResponse:
+    async def get_info(
+            self,
+            product_list: ProductListResponse,
+            wait: bool = True,
+            concurrency: Optional[int] = None,
+            mode: Optional[Model_Modes] = None,
+            item_ttl: Optional[int] = None
+    ) -> ProductInfoResponse:
         """
         Возвращает список товаров.
 
+        С item_ttl информация о каждом товаре кэшируется отдельно по артикулу в OzonClient.item_cache,
+        и запрашиваются только товары, которых нет в кэше или запись о которых устарела.
+        Тогда товары возвращаются в порядке product_list.
+
         :param product_list: ProductListResponse - Вывод OzonClient.product.get_list с запроса на v2/product/list.
         :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param concurrency: Int > 0 - Количество одновременно запрашиваемых частей. По умолчанию OzonClient.chunk_concurrency.
+        :param mode: Model_Modes - Способ создания моделей ответа, например "compact" для очень больших каталогов. По умолчанию OzonClient.model_mode.
+        :param item_ttl: Int - Время жизни кэша отдельных товаров в секундах. По умолчанию OzonClient.item_ttl.
 
         :return: ProductListResponse
+        :raises BatchError: Если часть запросов не выполнена. BatchError.result содержит ответ по выполненным частям.
         """
         offer_ids: List[str] = [offer.id for offer in product_list.offers]
+        item_ttl = item_ttl if item_ttl is not None else self._client.item_ttl
+
+        cached = self._get_cached_info(offer_ids, item_ttl)
+        requested = [offer_id for offer_id in dict.fromkeys(offer_ids) if offer_id not in cached]
 
         MAX_LIMIT = 1000
-        products = []
 
-        for param_offer_ids in list_division(offer_ids, MAX_LIMIT):
+        results, errors = await gather_chunks(
+            list_division(requested, MAX_LIMIT),
+            lambda param_offer_ids: self._get_info_chunk(param_offer_ids, wait),
+            concurrency or self._client.chunk_concurrency
+        )
+        products = [item for result in results if result is not None for item in result]
+
+        if item_ttl is not None:
+            self._set_cached_info(products, item_ttl)
+            products = self._merge_info(offer_ids, cached, products)
+
+        response = ProductInfoResponse.from_response(products, mode or self._client.model_mode)
+
+        if errors:
+            raise BatchError(response, errors, self._client.locale)
 
-            body = {
-                "offer_id": param_offer_ids,
-                "product_id": [],
-                "sku": []
-            }
+        return response
 
-            data = await self._client.fetch('post', 'v2/product/info/list', wait=wait, time=60, json=body)
+    async def _get_info_chunk(self, offer_ids: List[str], wait: bool) -> List[dict]:
+        body = {
+            "offer_id": offer_ids,
+            "product_id": [],
+            "sku": []
+        }
+
+        data = await self._client.fetch('post', 'v2/product/info/list', wait=wait, time=60, json=body)
+
+        return data["result"]["items"]
+
+    async def _get_info_chunk_cached(self, offer_ids: List[str], wait: bool, item_ttl: Optional[int]) -> List[dict]:
+        """
+        То же, что _get_info_chunk, но с кэшем отдельных товаров: запрашиваются только товары, которых нет в кэше.
+        """
+        if item_ttl is None:
+            return await self._get_info_chunk(offer_ids, wait)
 
-            products.extend(data["result"]["items"])
+        cached = self._get_cached_info(offer_ids, item_ttl)
+        requested = [offer_id for offer_id in dict.fromkeys(offer_ids) if offer_id not in cached]
+        items = await self._get_info_chunk(requested, wait) if requested else []
+        self._set_cached_info(items, item_ttl)
+        return self._merge_info(offer_ids, cached, items)
 
-        return ProductInfoResponse.from_response(products)
+    def _info_key(self, offer_id: str) -> str:
+        # Префикс совпадает с ключами ttl_cache, поэтому invalidate_cache("Product.get_info") удаляет и эти записи
+        # из OzonClient.item_cache.
+        return f"{self._client.cache_namespace}:Product.get_info:offer:{offer_id}"
+
+    def _get_cached_info(self, offer_ids: Iterable[str], item_ttl: Optional[int]) -> Dict[str, dict]:
+        """
+        Возвращает сохраненные ответы API по артикулам.
+        """
+        if item_ttl is None:
+            return {}
+
+        keys = {self._info_key(offer_id): offer_id for offer_id in offer_ids}
+        cached = {keys[key]: item for key, item in self._client.item_cache.get_many(keys).items()}
+
+        metrics = self._client.metrics
+        metrics.increment("ozon_cache_items_total", {"method": "Product.get_info", "result": "hit"}, len(cached))
+        metrics.increment(
+            "ozon_cache_items_total", {"method": "Product.get_info", "result": "miss"}, len(keys) - len(cached)
+        )
+        return cached
+
+    def _set_cached_info(self, items: List[dict], item_ttl: int):
+        if items:
+            self._client.item_cache.set_many({self._info_key(item["offer_id"]): item for item in items}, item_ttl)
+
+    @staticmethod
+    def _merge_info(offer_ids: List[str], cached: Dict[str, dict], items: List[dict]) -> List[dict]:
+        """
+        Объединяет сохраненные и полученные ответы API в порядке offer_ids.
+        """
+        by_offer_id = dict(cached)
+        by_offer_id.update((item["offer_id"], item) for item in items)
+        return [by_offer_id[offer_id] for offer_id in dict.fromkeys(offer_ids) if offer_id in by_offer_id]
@@ -1,13 +1,18 @@
 from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
     Optional,
-    List
+    List,
+    Dict,
+    Tuple
 )
 
 from .tools import list_division
+from .tools import gather_chunks
+
+if TYPE_CHECKING:
+    from ..client import OzonClient
 
-from ..client import (
-    OzonClient
-)
 from ..models.stocks import (
     StocksResponse,
     StocksResponseFBS,
@@ -21,110 +26,218 @@ from ..models.product import (
 
 from ..modules.tools import ttl_cache
 
+from ..types import Model_Modes
+
 from ..exceptions.params import (
     ParamLimitError
 )
+from ..exceptions.api import BatchError
 
 
 class Stocks:
     """
     Модули для работы с остатками товаров
     """
-    def __init__(self, client: OzonClient):
+    def __init__(self, client: "OzonClient"):
         self._client = client
+        self._snapshot: Dict[Tuple[str, int], int] = {}
+
+    def seed_snapshot(self, stocks: StocksResponseFBS):
+        """
+        Запоминает остатки как последние примененные. Используется для update(delta=True).
+
+        :param stocks: StocksResponseFBS - Вывод OzonClient.stocks.get_fbs.
+        """
+        for offer in stocks.offers:
+            self._snapshot[(offer.id, offer.warehouse_id)] = offer.quantity
+
+    def reset_snapshot(self):
+        """
+        Забывает последние примененные остатки. Следующий update(delta=True) отправит все строки.
+        """
+        self._snapshot.clear()
 
     @ttl_cache
-    async def get(self, limit: Optional[int] = None, wait: bool = True) -> StocksResponse:
+    async def get(
+            self,
+            limit: Optional[int] = None,
+            wait: bool = True,
+            mode: Optional[Model_Modes] = None
+    ) -> StocksResponse:
         """
         Возвращает информацию о количестве товаров на складах FBS и FBO.
 
         :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
         :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param mode: Model_Modes - Способ создания моделей ответа, например "compact" для очень больших каталогов. По умолчанию OzonClient.model_mode.
 
         :return: StocksResponse
         """
+        stocks = [item async for items in self._iter_pages(limit, wait) for item in items]
+        return StocksResponse.from_response(stocks, mode or self._client.model_mode)
+
+    async def iter_stocks(
+            self,
+            limit: Optional[int] = None,
+            wait: bool = True,
+            mode: Optional[Model_Modes] = None
+    ) -> AsyncIterator[StocksResponse.Offer]:
+        """
+        Возвращает остатки товаров на складах FBS и FBO по мере получения страниц, не накапливая весь список в памяти.
 
-        if limit <= 0:
+        :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
+        :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param mode: Model_Modes - Способ создания моделей ответа, например "compact" для очень больших каталогов. По умолчанию OzonClient.model_mode.
+
+        :return: AsyncIterator[StocksResponse.Offer]
+        """
+
+        async for items in self._iter_pages(limit, wait):
+            for offer in StocksResponse.from_response(items, mode or self._client.model_mode).offers:
+                yield offer
+
+    async def _iter_pages(self, limit: Optional[int] = None, wait: bool = True) -> AsyncIterator[List[dict]]:
+        if (limit is not None) and (limit <= 0):
             raise ParamLimitError(self._client.locale)
 
         MAX_LIMIT = 1000
         last_id = ''
-        stocks = []
+        received = 0
+        pages = 0
 
-        while True:
+        try:
+            while True:
 
-            body = {
-                "filter": {},
-                "last_id": last_id,
-                "limit": min(MAX_LIMIT, limit - len(stocks)) if limit is not None else MAX_LIMIT
-            }
+                body = {
+                    "filter": {},
+                    "last_id": last_id,
+                    "limit": min(MAX_LIMIT, limit - received) if limit is not None else MAX_LIMIT
+                }
 
-            data = await self._client.fetch('post', 'v3/product/info/stocks', wait=wait, time=60, json=body)
+                data = await self._client.fetch('post', 'v3/product/info/stocks', wait=wait, time=60, json=body)
+                pages += 1
 
-            stocks.extend(data["result"]["items"])
+                items = data["result"]["items"]
+                received += len(items)
 
-            if (body["limit"] < MAX_LIMIT) or (data["result"]["total"] < body["limit"]) or (len(stocks) >= limit):
-                break
+                yield items
 
-            last_id = data["result"]["last_id"]
+                if ((body["limit"] < MAX_LIMIT) or (len(items) < body["limit"]) or (data["result"]["total"] < body["limit"])
+                        or ((limit is not None) and (received >= limit))):
+                    break
 
-        return StocksResponse.from_response(stocks)
+                last_id = data["result"]["last_id"]
+        finally:
+            self._client.metrics.observe("ozon_pages", pages, {"endpoint": "v3/product/info/stocks"})
 
     @ttl_cache
-    async def get_fbs(self, product_info: ProductInfoResponse, wait: bool = True) -> StocksResponseFBS:
+    async def get_fbs(
+            self,
+            product_info: ProductInfoResponse,
+            wait: bool = True,
+            concurrency: Optional[int] = None,
+            mode: Optional[Model_Modes] = None
+    ) -> StocksResponseFBS:
         """
         Возвращает информацию о количестве товаров на каждом складе FBS.
 
         :param product_info: ProductInfoResponse - Вывод OzonClient.product.get_info с запроса на v2/product/info/list.
         :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param concurrency: Int > 0 - Количество одновременно запрашиваемых частей. По умолчанию OzonClient.chunk_concurrency.
+        :param mode: Model_Modes - Способ создания моделей ответа, например "compact" для очень больших каталогов. По умолчанию OzonClient.model_mode.
 
         :return: StocksResponseFBS
+        :raises BatchError: Если часть запросов не выполнена. BatchError.result содержит ответ по выполненным частям.
         """
 
-        skus: List[List[int | str]] = [[offer.sku, offer.id] for offer in product_info.offers if offer.sku]
+        skus: List[Tuple[int, str]] = [(offer.sku, offer.id) for offer in product_info.offers if offer.sku]
 
         MAX_LIMIT = 500
-        stocks = []
 
-        for param_skus in list_division(skus, MAX_LIMIT):
-            body = {
-                "sku": [item[0] for item in param_skus]
-            }
+        results, errors = await gather_chunks(
+            list_division(skus, MAX_LIMIT),
+            lambda param_skus: self._get_fbs_chunk(param_skus, wait),
+            concurrency or self._client.chunk_concurrency
+        )
+        stocks = [item for result in results if result is not None for item in result]
+        response = StocksResponseFBS.from_response(stocks, mode or self._client.model_mode)
+
+        if errors:
+            raise BatchError(response, errors, self._client.locale)
+
+        return response
 
-            data = await self._client.fetch('post', 'v1/product/info/stocks-by-warehouse/fbs', wait=wait, time=60, json=body)
+    async def _get_fbs_chunk(self, param_skus: List[Tuple[int, str]], wait: bool) -> List[dict]:
+        offer_ids: Dict[int, str] = dict(param_skus)
 
-            changed_data = []
-            for data_item in data["result"]:
-                for sku_item in param_skus:
-                    if sku_item[0] == data_item["sku"]:
-                        data_item["id"] = sku_item[1]
-                        changed_data.append(data_item)
-                        break
+        body = {
+            "sku": list(offer_ids)
+        }
 
-            stocks.extend(changed_data)
+        data = await self._client.fetch('post', 'v1/product/info/stocks-by-warehouse/fbs', wait=wait, time=60, json=body)
 
-        return StocksResponseFBS.from_response(stocks)
+        changed_data = []
+        for data_item in data["result"]:
+            offer_id = offer_ids.get(data_item["sku"])
+            if offer_id is not None:
+                data_item["offer_id"] = offer_id
+                changed_data.append(data_item)
 
-    async def update(self, update_params: List[StocksUpdateParams], wait: bool = True) -> StocksUpdateResponse:
+        return changed_data
+
+    async def update(
+            self,
+            update_params: List[StocksUpdateParams],
+            wait: bool = True,
+            concurrency: Optional[int] = None,
+            delta: bool = False
+    ) -> StocksUpdateResponse:
         """
         Обновляет остатки товаров.
 
+        Успешно примененные остатки запоминаются по паре (offer_id, warehouse_id). При delta=True отправляются
+        только строки, остаток которых отличается от запомненного. Начальные значения задает seed_snapshot.
+
         :param update_params: List[StocksUpdateParams] - Информация о товарах на складах.
         :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param concurrency: Int > 0 - Количество одновременно отправляемых частей. По умолчанию OzonClient.chunk_concurrency.
+        :param delta: Bool - Отправить только изменившиеся остатки.
 
-        :return: StocksUpdateResponse
+        :return: StocksUpdateResponse - Ответ только по отправленным строкам.
+        :raises BatchError: Если часть запросов не выполнена. BatchError.result содержит ответ по выполненным частям.
         """
 
         MAX_LIMIT = 100
-        updates = []
 
-        for params in list_division(update_params, MAX_LIMIT):
-            body = {
-                "stocks": params
-            }
+        if delta:
+            update_params = [
+                params for params in update_params
+                if self._snapshot.get((params.offer_id, params.warehouse_id)) != params.stock
+            ]
+
+        results, errors = await gather_chunks(
+            list_division(update_params, MAX_LIMIT),
+            lambda params: self._update_chunk(params, wait),
+            concurrency or self._client.chunk_concurrency
+        )
+        updates = [item for result in results if result is not None for item in result]
+        response = StocksUpdateResponse.from_response(updates, self._client.model_mode)
+
+        sent = {(params.offer_id, params.warehouse_id): params.stock for params in update_params}
+        for offer in response.offers:
+            if offer.updated and ((offer.id, offer.warehouse_id) in sent):
+                self._snapshot[(offer.id, offer.warehouse_id)] = sent[(offer.id, offer.warehouse_id)]
+
+        if errors:
+            raise BatchError(response, errors, self._client.locale)
+
+        return response
 
-            data = await self._client.fetch('post', 'v2/products/stocks', wait=wait, time=60, json=body)
+    async def _update_chunk(self, params: List[StocksUpdateParams], wait: bool) -> List[dict]:
+        body = {
+            "stocks": [param.model_dump() for param in params]
+        }
 
-            updates.extend(data["result"])
+        data = await self._client.fetch('post', 'v2/products/stocks', wait=wait, time=60, json=body)
 
-        return StocksUpdateResponse.from_response(updates)
+        return data["result"]
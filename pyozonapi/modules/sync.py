@@ -0,0 +1,142 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    List,
+    Dict,
+    Tuple
+)
+
+if TYPE_CHECKING:
+    from ..client import OzonClient
+
+from ..models.product import ProductInfoResponse
+from ..models.stocks import (
+    StocksResponseFBS,
+    StocksSyncResponse
+)
+
+from ..types import Info_Statuses
+
+from ..exceptions.api import BatchError
+
+
+class Sync:
+    """
+    Составные операции, объединяющие несколько методов API
+    """
+    def __init__(self, client: "OzonClient"):
+        self._client = client
+
+    async def stocks_fbs(
+            self,
+            status: Info_Statuses = "ALL",
+            limit: Optional[int] = None,
+            wait: bool = True,
+            concurrency: Optional[int] = None,
+            buffer: int = 4
+    ) -> StocksSyncResponse:
+        """
+        Возвращает информацию о товарах и их остатки на каждом складе FBS.
+
+        Делает то же, что последовательные product.get_list, product.get_info и stocks.get_fbs, но этапы
+        выполняются конвейером: артикулы со страниц списка товаров сразу отправляются в запросы информации
+        частями по 1000, а SKU из ответов - в запросы остатков частями по 500. Товары возвращаются в порядке
+        списка товаров, остатки - в порядке получения информации о товарах.
+        Если задан OzonClient.item_ttl, информация о товарах берется из кэша отдельных товаров, как в product.get_info.
+
+        :param status: Str - Статус видимости товара.
+        :param limit: Int > 0 - Количество товаров для получения. Если значение больше количества всех товаров или не указано, то выведет их максимальное количество.
+        :param wait: Bool - Ждать при достижении лимита на запросы.
+        :param concurrency: Int > 0 - Количество одновременных запросов на каждом этапе. По умолчанию OzonClient.chunk_concurrency.
+        :param buffer: Int > 0 - Количество частей, ожидающих обработки между этапами.
+
+        :return: StocksSyncResponse
+        :raises BatchError: Если часть запросов информации или остатков не выполнена.
+            BatchError.result содержит ответ по выполненным частям.
+        """
+        INFO_LIMIT = 1000
+        FBS_LIMIT = 500
+
+        concurrency = concurrency or self._client.chunk_concurrency
+        info_queue: "asyncio.Queue[Optional[Tuple[int, List[str]]]]" = asyncio.Queue(max(1, buffer))
+        fbs_queue: "asyncio.Queue[Optional[Tuple[int, List[Tuple[int, str]]]]]" = asyncio.Queue(max(1, buffer))
+
+        info_results: Dict[int, List[dict]] = {}
+        fbs_results: Dict[int, List[dict]] = {}
+        errors: Dict[int, BaseException] = {}
+        skus: List[Tuple[int, str]] = []
+        fbs_batches = 0
+
+        async def put_skus(flush: bool = False):
+            nonlocal skus, fbs_batches
+            while (len(skus) >= FBS_LIMIT) or (flush and skus):
+                batch, skus = skus[:FBS_LIMIT], skus[FBS_LIMIT:]
+                # Номер части занимается до ожидания места в очереди: put_skus вызывают несколько info_worker.
+                index, fbs_batches = fbs_batches, fbs_batches + 1
+                await fbs_queue.put((index, batch))
+
+        async def list_stage():
+            offer_ids: List[str] = []
+            batches = 0
+            async for items in self._client.product._iter_list_pages(status, limit, wait):
+                offer_ids.extend(item["offer_id"] for item in items)
+                while len(offer_ids) >= INFO_LIMIT:
+                    await info_queue.put((batches, offer_ids[:INFO_LIMIT]))
+                    offer_ids = offer_ids[INFO_LIMIT:]
+                    batches += 1
+            if offer_ids:
+                await info_queue.put((batches, offer_ids))
+
+        async def info_worker():
+            while (task := await info_queue.get()) is not None:
+                index, offer_ids = task
+                try:
+                    items = await self._client.product._get_info_chunk_cached(offer_ids, wait, self._client.item_ttl)
+                except Exception as exc:
+                    errors[len(errors)] = exc
+                    continue
+                info_results[index] = items
+                skus.extend((item["sku"], item["offer_id"]) for item in items if item.get("sku"))
+                await put_skus()
+
+        async def fbs_worker():
+            while (task := await fbs_queue.get()) is not None:
+                index, batch = task
+                try:
+                    fbs_results[index] = await self._client.stocks._get_fbs_chunk(batch, wait)
+                except Exception as exc:
+                    errors[len(errors)] = exc
+
+        info_workers = [asyncio.create_task(info_worker()) for _ in range(concurrency)]
+        fbs_workers = [asyncio.create_task(fbs_worker()) for _ in range(concurrency)]
+
+        try:
+            await list_stage()
+            for _ in info_workers:
+                await info_queue.put(None)
+            await asyncio.gather(*info_workers)
+
+            await put_skus(flush=True)
+            for _ in fbs_workers:
+                await fbs_queue.put(None)
+            await asyncio.gather(*fbs_workers)
+        finally:
+            for worker in info_workers + fbs_workers:
+                worker.cancel()
+            await asyncio.gather(*info_workers, *fbs_workers, return_exceptions=True)
+
+        mode = self._client.model_mode
+        response = StocksSyncResponse.model_construct(
+            products=ProductInfoResponse.from_response(
+                [item for index in sorted(info_results) for item in info_results[index]], mode
+            ),
+            stocks=StocksResponseFBS.from_response(
+                [item for index in sorted(fbs_results) for item in fbs_results[index]], mode
+            )
+        )
+
+        if errors:
+            raise BatchError(response, errors, self._client.locale)
+
+        return response
@@ -1,15 +1,25 @@
-import time
+import asyncio
+import inspect
 from typing import (
     Union,
+    List,
+    Dict,
+    Tuple,
     Protocol,
     Optional,
     Callable,
     Awaitable,
-    Any
+    Any,
+    Hashable,
+    TYPE_CHECKING
 )
 from math import ceil
 from functools import wraps
-from ..client import OzonClient
+
+from ..cache import MISSING, fingerprint
+
+if TYPE_CHECKING:
+    from ..client import OzonClient
 
 
 def list_division(_list: Union[list, str], divider: int) -> list:
@@ -26,30 +36,97 @@ def list_division(_list: Union[list, str], divider: int) -> list:
     return result
 
 
+async def gather_chunks(
+        chunks: List[Any],
+        worker: Callable[[Any], Awaitable[Any]],
+        concurrency: int
+) -> Tuple[List[Any], Dict[int, BaseException]]:
+    """
+    Выполняет worker для каждой части одновременно, но не более concurrency штук за раз.
+
+    :return: Результаты в порядке частей (None для неудачных) и ошибки по номерам частей.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: Any) -> Any:
+        async with semaphore:
+            return await worker(chunk)
+
+    results = await asyncio.gather(*(run(chunk) for chunk in chunks), return_exceptions=True)
+    errors: Dict[int, BaseException] = {}
+
+    for index, result in enumerate(results):
+        if isinstance(result, BaseException):
+            errors[index] = result
+            results[index] = None
+
+    return results, errors
+
+
 class HasClient(Protocol):
-    _client: OzonClient
+    _client: "OzonClient"
+
+
+def _identity(value: Any) -> Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        return type(value), id(value)
+    return value
 
 
 def ttl_cache(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
-    cache = {}
+    """
+    Кэширует результат метода модуля в OzonClient.cache на ttl секунд.
+
+    Ключ строится из пространства имен клиента, имени метода и отпечатка аргументов.
+    Одновременные вызовы с одинаковыми аргументами ожидают один общий запрос. Без ttl отпечаток
+    не вычисляется: общий запрос ожидают вызовы с теми же объектами аргументов.
+    """
+    signature = inspect.signature(func)
+    inflight: Dict[Hashable, asyncio.Future] = {}
 
     @wraps(func)
     async def wrapper(self: HasClient, *args, ttl: Optional[int] = None, **kwargs):
-        client_id = id(self._client)
-        cache_key = (client_id, func.__name__, args, tuple(kwargs.items()))
-        current_time = time.time()
+        client = self._client
+        ttl = ttl if ttl is not None else getattr(client, "ttl", None)
 
-        ttl = ttl if ttl is not None else getattr(self._client, "ttl", None)
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(list(bound.arguments.items())[1:])
+
+        if ttl is None:
+            # Аргументы живут, пока выполняется запрос, поэтому их id не переиспользуются до его завершения.
+            cache_key: Hashable = (
+                client.cache_namespace, func.__qualname__,
+                tuple((name, _identity(value)) for name, value in arguments.items())
+            )
+        else:
+            # Результат зависит от способа создания моделей, поэтому в ключ входит фактический режим,
+            # в том числе режим клиента, если метод его не принимает или он не передан.
+            keyed = dict(arguments, mode=arguments.get("mode") or getattr(client, "model_mode", None))
+            cache_key = f"{client.cache_namespace}:{func.__qualname__}:{fingerprint(keyed)}"
 
-        if (ttl is not None) and (cache_key in cache):
-            value, expiration = cache[cache_key]
-            if (expiration is None) or (current_time < expiration):
+        if ttl is not None:
+            value = client.cache.get(cache_key)
+            if value is not MISSING:
                 return value
 
-        result = await func(self, *args, **kwargs)
-        expiration = (current_time + ttl) if ttl else None
-        cache[cache_key] = (result, expiration)
+        task = inflight.get(cache_key)
 
-        return result
+        if task is None:
+            task = asyncio.ensure_future(func(self, *args, **kwargs))
+            inflight[cache_key] = task
+
+            def done(finished: asyncio.Future):
+                inflight.pop(cache_key, None)
+                if finished.cancelled() or (finished.exception() is not None):
+                    return
+                if ttl is not None:
+                    client.cache.set(cache_key, finished.result(), ttl)
+
+            task.add_done_callback(done)
+
+        return await asyncio.shield(task)
 
     return wrapper
@@ -0,0 +1,401 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import socket
+from time import monotonic, perf_counter
+from datetime import datetime
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Union,
+    Callable
+)
+from aiohttp import web
+
+from .cache import BaseCache, MemoryCache, MISSING
+from .types import Push_Overflow_Policies
+from .codec import JsonCodec, default_codec
+from .metrics import MetricsSink, PrometheusSink
+from .models.base import BasePushEvent
+from .models.push import parse_push_event
+
+logger = logging.getLogger(__name__)
+
+
+class OzonPushClient:
+
+    def __init__(
+            self,
+            host: str = '0.0.0.0',
+            port: int  = 8080,
+            webhook_path: str = "/ozon/push",
+            version: str = '1.0',
+            name: str = 'Bot',
+            codec: Optional[JsonCodec] = None,
+            workers: int = 0,
+            queue_size: int = 1000,
+            overflow: Push_Overflow_Policies = "wait",
+            batch_size: int = 1,
+            batch_timeout: float = 0.1,
+            dedup: bool = True,
+            dedup_store: Optional[BaseCache] = None,
+            dedup_ttl: float = 3600,
+            dedup_size: int = 100000,
+            metrics: Optional[MetricsSink] = None,
+            metrics_path: Optional[str] = "/metrics",
+            processes: int = 1,
+            restart_delay: float = 1.0
+    ):
+        """
+        :param host: Хост, на котором будет запущен сервер.
+        :param port: Порт, на котором будет запущен сервер.
+        :param webhook_path: Путь, на который будут приходить уведомления.
+        :param codec: JsonCodec - Кодек JSON. По умолчанию orjson или msgspec, если установлены, иначе стандартный json.
+        :param workers: Количество обработчиков очереди. Если 0, событие обрабатывается до ответа на уведомление.
+            Иначе событие ставится в очередь, а ответ отправляется сразу.
+        :param queue_size: Максимальный размер очереди событий.
+        :param overflow: Поведение при заполненной очереди: "wait" - ждать места, "drop" - подтвердить и отбросить
+            событие, "reject" - ответить ошибкой, чтобы Ozon повторил отправку позже.
+        :param batch_size: Максимальное количество событий, передаваемых в обработчик за раз. Если больше 1,
+            обработчик получает список событий.
+        :param batch_timeout: Время ожидания заполнения пакета в секундах.
+        :param dedup: Подтверждать повторно доставленные уведомления, не передавая их в обработчики.
+            Уведомление определяется по message_type, posting_number, новому статусу и времени события.
+        :param dedup_store: BaseCache - Хранилище полученных уведомлений. По умолчанию MemoryCache(dedup_size),
+            для хранения между перезапусками - SqliteCache.
+        :param dedup_ttl: Время хранения полученного уведомления в секундах.
+        :param dedup_size: Максимальное количество хранимых уведомлений в хранилище по умолчанию.
+        :param metrics: MetricsSink - Приемник метрик уведомлений и обработчиков. По умолчанию метрики не собираются.
+        :param metrics_path: Путь, по которому отдаются метрики, если metrics - PrometheusSink. Если None - не отдаются.
+        :param processes: Количество процессов сервера. Если больше 1, start() создает процессы через fork, и все они
+            принимают уведомления на одном порту (SO_REUSEPORT, только Linux и BSD). Обработчики нужно зарегистрировать
+            до start(). У каждого процесса свои очередь, хранилище полученных уведомлений и метрики; чтобы повторы
+            распознавались всеми процессами, используйте dedup_store=SqliteCache(...).
+        :param restart_delay: Период проверки процессов сервера в секундах. Завершившиеся процессы перезапускаются.
+        """
+        self.host: str = host
+        self.port: int = port
+        self.webhook_path: str = webhook_path
+        self.version: str = version
+        self.name: str = name
+        self.codec: JsonCodec = codec if codec is not None else default_codec()
+        self.workers: int = workers
+        self.queue_size: int = queue_size
+        self.overflow: Push_Overflow_Policies = overflow
+        self.batch_size: int = batch_size
+        self.batch_timeout: float = batch_timeout
+        self.dedup_ttl: float = dedup_ttl
+        self._dedup: Optional[BaseCache] = (dedup_store if dedup_store is not None else MemoryCache(dedup_size)) if dedup else None
+        self.metrics: MetricsSink = metrics if metrics is not None else MetricsSink()
+        self.app = web.Application()
+        self.app.router.add_post(self.webhook_path, self._handle_push)
+        if (metrics_path is not None) and isinstance(self.metrics, PrometheusSink):
+            self.app.router.add_get(metrics_path, self._handle_metrics)
+        self._on_event: Optional[Callable[[BasePushEvent], None]] = None
+        self._handlers: Dict[str, List[Callable[[BasePushEvent], None]]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumers: List[asyncio.Task] = []
+        self.processes: int = processes
+        self.restart_delay: float = restart_delay
+        self._processes: List[multiprocessing.Process] = []
+        self._supervisor: Optional[asyncio.Task] = None
+
+    def on_event(self, callback: Callable[[BasePushEvent], None]) -> Callable[[BasePushEvent], None]:
+        """
+        Устанавливает функцию обратного вызова для обработки всех событий.
+        """
+        self._on_event = callback
+        return callback
+
+    def on(self, *message_types: str) -> Callable[[Callable], Callable]:
+        """
+        Регистрирует обработчик событий указанных типов. Используется как декоратор:
+
+            @push.on("TYPE_NEW_POSTING")
+            async def new_posting(event: PushNewPosting): ...
+
+        Уведомления, на которые нет ни одного обработчика, подтверждаются без создания модели.
+
+        :param message_types: str - Типы уведомлений, например "TYPE_NEW_POSTING".
+        """
+        def decorator(callback: Callable) -> Callable:
+            for message_type in message_types:
+                self._handlers.setdefault(message_type, []).append(callback)
+            return callback
+        return decorator
+
+    async def _handle_push(self, request: web.Request):
+        """
+        Обрабатывает входящие push-уведомления от Ozon Seller API.
+        """
+        try:
+            date = datetime.now()
+            data = self.codec.loads(await request.read())
+            message_type = data['message_type']
+            dedup_key = self._dedup_key(data)
+            self.metrics.increment("ozon_push_events_total", {"message_type": message_type})
+
+            if (dedup_key is not None) and (self._dedup.get(dedup_key) is not MISSING):
+                self.metrics.increment("ozon_push_duplicates_total", {"message_type": message_type})
+                return web.Response(body=self.codec.dumps({'result': True}), status=200, content_type='application/json')
+
+            if (self._on_event is not None) or (message_type in self._handlers):
+                event = parse_push_event(data)
+
+                if dedup_key is not None:
+                    self._dedup.set(dedup_key, True, self.dedup_ttl)
+
+                try:
+                    if self._queue is None:
+                        await self._dispatch(event)
+                        accepted = True
+                    else:
+                        accepted = await self._enqueue(event)
+                except:
+                    self._forget(dedup_key)
+                    raise
+
+                if not accepted:
+                    self._forget(dedup_key)
+                    self.metrics.increment("ozon_push_rejected_total", {"message_type": message_type})
+                    return self._error_response("Очередь уведомлений переполнена", 503)
+
+            body = {
+                'result': True
+            }
+
+            if message_type == "TYPE_PING":
+                body = {
+                    "version": self.version,
+                    "name": self.name,
+                    "time": str(date.strftime('%Y-%m-%dT%H:%M:%SZ'))
+                }
+
+            return web.Response(body=self.codec.dumps(body), status=200, content_type='application/json')
+        except:
+            return self._error_response("ошибка", 400)
+
+    def _dedup_key(self, data: dict) -> Optional[str]:
+        """
+        Возвращает ключ уведомления для поиска повторов или None, если повторы не отслеживаются.
+        """
+        if (self._dedup is None) or ('posting_number' not in data):
+            return None
+
+        return "push:" + "|".join(str(data.get(key, "")) for key in (
+            'message_type',
+            'posting_number',
+            'new_state',
+            'changed_state_date',
+            'in_process_at',
+        ))
+
+    def _forget(self, dedup_key: Optional[str]):
+        """
+        Удаляет уведомление из полученных, чтобы его повторная доставка была обработана.
+        """
+        if dedup_key is not None:
+            self._dedup.delete(dedup_key)
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        """
+        Отдает метрики в текстовом формате Prometheus.
+        """
+        return web.Response(body=self.metrics.render().encode(), headers={"Content-Type": PrometheusSink.content_type})
+
+    def _error_response(self, message: str, status: int) -> web.Response:
+        return web.Response(body=self.codec.dumps({
+            "error": {
+                "code": "ERROR_UNKNOWN",
+                "message": message,
+                "details": None
+            }
+        }), status=status, content_type='application/json')
+
+    async def _call(self, handler: Callable, event: Union[BasePushEvent, List[BasePushEvent]], message_type: str):
+        """
+        Вызывает обработчик и записывает время его работы.
+        """
+        started = perf_counter()
+        try:
+            await handler(event)
+        finally:
+            self.metrics.observe("ozon_push_handler_seconds", perf_counter() - started, {"message_type": message_type})
+
+    async def _dispatch(self, event: Union[BasePushEvent, List[BasePushEvent]]):
+        if isinstance(event, list):
+            by_type: Dict[str, List[BasePushEvent]] = {}
+            for item in event:
+                by_type.setdefault(item.message_type, []).append(item)
+            for message_type, items in by_type.items():
+                for handler in self._handlers.get(message_type, ()):
+                    await self._call(handler, items, message_type)
+        else:
+            for handler in self._handlers.get(event.message_type, ()):
+                await self._call(handler, event, event.message_type)
+
+        if self._on_event:
+            await self._call(self._on_event, event, event.message_type if not isinstance(event, list) else "batch")
+
+    async def _enqueue(self, event: BasePushEvent) -> bool:
+        """
+        Ставит событие в очередь. Возвращает False, если событие нужно отклонить.
+        """
+        if self.overflow == "wait":
+            await self._queue.put(event)
+            return True
+
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return self.overflow == "drop"
+
+        return True
+
+    async def _consume(self):
+        """
+        Забирает события из очереди и передает их в обработчик по одному или пакетами.
+        """
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+
+            if self.batch_size > 1:
+                deadline = loop.time() + self.batch_timeout
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+            try:
+                await self._dispatch(batch if self.batch_size > 1 else batch[0])
+            except Exception:
+                logger.exception("Push event handler failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def start(self):
+        """
+        Запускает сервер для приема уведомлений.
+        """
+        if self.processes > 1:
+            await self._start_processes()
+            print(f"Server started at http://{self.host}:{self.port}{self.webhook_path} with {self.processes} processes")
+            return
+
+        await self._start_server()
+        print(f"Server started at http://{self.host}:{self.port}{self.webhook_path}")
+
+    async def _start_server(self, reuse_port: Optional[bool] = None):
+        if self.workers > 0:
+            self._queue = asyncio.Queue(self.queue_size)
+            self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port, reuse_port=reuse_port)
+        await site.start()
+
+    async def _start_processes(self):
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("Несколько процессов сервера требуют поддержки SO_REUSEPORT")
+
+        self._processes = []
+        for index in range(self.processes):
+            self._processes.append(await self._spawn(index))
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def _spawn(self, index: int) -> multiprocessing.Process:
+        """
+        Создает процесс сервера.
+        """
+        process = multiprocessing.get_context("fork").Process(
+            target=self._run_process, name=f"ozon-push-{index}", daemon=True
+        )
+        # fork выполняется из потока исполнителя: в потоке дочернего процесса не должно быть запущенного цикла событий.
+        await asyncio.get_running_loop().run_in_executor(None, process.start)
+        return process
+
+    def _run_process(self):
+        self.processes = 1
+        self._processes = []
+        self._supervisor = None
+        asyncio.run(self._serve_process())
+
+    async def _serve_process(self):
+        """
+        Принимает уведомления до SIGTERM или SIGINT, затем обрабатывает оставшиеся события и завершается.
+        """
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signal_number, stopping.set)
+
+        await self._start_server(reuse_port=True)
+        await stopping.wait()
+        await self.stop()
+
+    async def _supervise(self):
+        """
+        Перезапускает завершившиеся процессы сервера.
+        """
+        while True:
+            await asyncio.sleep(self.restart_delay)
+            for index, process in enumerate(self._processes):
+                if process.is_alive():
+                    continue
+                logger.warning("Push server process %s exited with code %s, restarting", process.name, process.exitcode)
+                process.join()
+                self._processes[index] = await self._spawn(index)
+
+    def _join_processes(self, timeout: Optional[float]):
+        deadline = (monotonic() + timeout) if timeout is not None else None
+        for process in self._processes:
+            process.join(max(0.0, deadline - monotonic()) if deadline is not None else None)
+        for process in self._processes:
+            if process.is_alive():
+                process.kill()
+                process.join()
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Останавливает сервер. Новые уведомления перестают приниматься, события из очереди обрабатываются до конца.
+
+        :param timeout: Максимальное время обработки оставшихся событий в секундах. Если не указано - без ограничения.
+            Процессы сервера, не завершившиеся за это время, останавливаются принудительно.
+        """
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+
+            for process in self._processes:
+                if process.is_alive():
+                    process.terminate()
+            await asyncio.get_running_loop().run_in_executor(None, self._join_processes, timeout)
+            self._processes = []
+
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        self._queue = None
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+from time import monotonic
+from datetime import datetime, timedelta, timezone
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Union
+)
+
+from .models.base import BasePushEvent
+from .models.posting import PostingState, PostingUnfulfilledResponse
+from .models.push import (
+    PushNewPosting,
+    PushPostingCancelled,
+    PushStateChanged
+)
+from .types import Posting_Statuses
+
+if TYPE_CHECKING:
+    from .client import OzonClient
+    from .push import OzonPushClient
+
+logger = logging.getLogger(__name__)
+
+# Статус отправления по подстатусу из push-уведомления TYPE_STATE_CHANGED.
+# Для подстатусов, которых нет в словаре, статус отправления не меняется.
+SUBSTATUS_STATUSES: Dict[str, str] = {
+    "posting_acceptance_in_progress": "acceptance_in_progress",
+    "posting_created": "awaiting_packaging",
+    "posting_awaiting_passport_data": "awaiting_packaging",
+    "posting_awaiting_registration": "awaiting_registration",
+    "posting_registration_error": "awaiting_registration",
+    "posting_registered": "awaiting_deliver",
+    "posting_not_in_carriage": "awaiting_deliver",
+    "posting_transferring_to_delivery": "awaiting_deliver",
+    "posting_in_arbitration": "arbitration",
+    "posting_in_client_arbitration": "client_arbitration",
+    "posting_driver_pick_up": "driver_pickup",
+    "posting_in_carriage": "delivering",
+    "posting_transferred_to_courier_service": "delivering",
+    "posting_in_courier_service": "delivering",
+    "posting_on_way_to_city": "delivering",
+    "posting_on_way_to_pickup_point": "delivering",
+    "posting_in_pickup_point": "delivering",
+    "posting_conditionally_delivered": "delivering",
+    "posting_returned_to_warehouse": "delivering",
+    "posting_delivered": "delivered",
+    "posting_received": "delivered",
+    "posting_not_in_sort_center": "not_accepted",
+    "posting_split_pending": "cancelled_from_split_pending",
+    "posting_canceled": "cancelled",
+    "sent_by_seller": "sent_by_seller",
+}
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    if (value is not None) and (value.tzinfo is None):
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class PostingStore:
+    """
+    Локальный индекс необработанных отправлений.
+
+    Заполняется один раз через OzonClient.posting.get_unfulfilled_list, затем обновляется push-уведомлениями
+    OzonPushClient и периодически сверяется с API. Запросы по статусу и складу выполняются по индексам в памяти.
+
+    Отправления, которые по уведомлению перешли в статус не из statuses (отменены, переданы в доставку),
+    удаляются из индекса сразу. Уведомление о новом отправлении не содержит время сборки, поэтому у таких
+    отправлений cutoff равен None до следующей сверки.
+
+    :param client: OzonClient - Клиент для загрузки и сверки отправлений.
+    :param statuses: Статусы отправлений, которые загружаются из API.
+    :param lookback: timedelta - Начало периода сборки относительно текущего времени.
+    :param lookahead: timedelta - Конец периода сборки относительно текущего времени.
+    """
+    def __init__(
+            self,
+            client: "OzonClient",
+            statuses: Sequence[Posting_Statuses] = ("awaiting_packaging", "awaiting_deliver"),
+            lookback: timedelta = timedelta(days=7),
+            lookahead: timedelta = timedelta(days=30)
+    ):
+        self._client = client
+        self.statuses: Sequence[Posting_Statuses] = statuses
+        self.lookback: timedelta = lookback
+        self.lookahead: timedelta = lookahead
+        self._postings: Dict[str, PostingState] = {}
+        self._updated: Dict[str, float] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._by_warehouse: Dict[Optional[int], Set[str]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def __contains__(self, posting_number: str) -> bool:
+        return posting_number in self._postings
+
+    def get(self, posting_number: str) -> Optional[PostingState]:
+        """
+        Возвращает состояние отправления или None.
+        """
+        return self._postings.get(posting_number)
+
+    def query(
+            self,
+            status: Optional[str] = None,
+            warehouse_id: Optional[int] = None,
+            cutoff_from: Optional[datetime] = None,
+            cutoff_to: Optional[datetime] = None,
+            include_unknown_cutoff: bool = True
+    ) -> List[PostingState]:
+        """
+        Возвращает отправления по фильтрам. Фильтры, которые не указаны, не применяются.
+
+        :param status: Str - Статус отправления.
+        :param warehouse_id: Int - ID склада FBS.
+        :param cutoff_from: Datetime - Время сборки, начало периода. Время без часового пояса считается UTC.
+        :param cutoff_to: Datetime - Время сборки, конец периода. Время без часового пояса считается UTC.
+        :param include_unknown_cutoff: Bool - Возвращать при фильтре по времени сборки отправления, время сборки
+            которых еще неизвестно: новые отправления из push-уведомлений до следующей сверки.
+        """
+        numbers: Optional[Set[str]] = None
+
+        if status is not None:
+            numbers = self._by_status.get(status, set())
+        if warehouse_id is not None:
+            by_warehouse = self._by_warehouse.get(warehouse_id, set())
+            numbers = by_warehouse if numbers is None else (numbers & by_warehouse)
+
+        postings = [self._postings[number] for number in numbers] if numbers is not None else list(self._postings.values())
+
+        cutoff_from, cutoff_to = _utc(cutoff_from), _utc(cutoff_to)
+        if (cutoff_from is not None) or (cutoff_to is not None):
+            postings = [
+                posting for posting in postings
+                if (include_unknown_cutoff and (posting.cutoff is None)) or (
+                    (posting.cutoff is not None)
+                    and ((cutoff_from is None) or (posting.cutoff >= cutoff_from))
+                    and ((cutoff_to is None) or (posting.cutoff <= cutoff_to))
+                )
+            ]
+
+        return postings
+
+    def _put(self, posting: PostingState, updated: Optional[float] = None):
+        self._remove(posting.posting_number)
+        self._postings[posting.posting_number] = posting
+        self._updated[posting.posting_number] = monotonic() if updated is None else updated
+        self._by_status.setdefault(posting.status, set()).add(posting.posting_number)
+        self._by_warehouse.setdefault(posting.warehouse_id, set()).add(posting.posting_number)
+
+    def _remove(self, posting_number: str):
+        posting = self._postings.pop(posting_number, None)
+        self._updated.pop(posting_number, None)
+        if posting is not None:
+            self._by_status[posting.status].discard(posting_number)
+            self._by_warehouse[posting.warehouse_id].discard(posting_number)
+
+    @staticmethod
+    def _from_order(order: PostingUnfulfilledResponse.Order) -> PostingState:
+        return PostingState(
+            posting_number=order.posting_number,
+            status=order.status,
+            substatus=order.substatus,
+            warehouse_id=order.delivery_method.warehouse_id if order.delivery_method is not None else None,
+            cutoff=_utc(order.shipment_date),
+            products={offer.sku: offer.quantity for offer in order.offers}
+        )
+
+    def apply(self, event: Union[BasePushEvent, Iterable[BasePushEvent]]):
+        """
+        Обновляет индекс по push-уведомлению или списку уведомлений. Прочие типы уведомлений игнорируются.
+        Отправления со статусом не из statuses удаляются из индекса.
+        """
+        for item in (event if isinstance(event, (list, tuple)) else (event,)):
+
+            if isinstance(item, PushNewPosting):
+                posting = PostingState(
+                    posting_number=item.posting_number,
+                    status="awaiting_packaging",
+                    substatus="posting_created",
+                    warehouse_id=item.warehouse_id,
+                    products={product.sku: product.quantity for product in item.products}
+                )
+
+            elif isinstance(item, PushPostingCancelled):
+                previous = self._postings.get(item.posting_number)
+                posting = PostingState(
+                    posting_number=item.posting_number,
+                    status="cancelled",
+                    substatus="posting_canceled",
+                    warehouse_id=item.warehouse_id,
+                    cutoff=previous.cutoff if previous is not None else None,
+                    products={product.sku: product.quantity for product in item.products}
+                )
+
+            elif isinstance(item, PushStateChanged):
+                previous = self._postings.get(item.posting_number)
+                if previous is None:
+                    continue
+                posting = previous.model_copy(update={
+                    "status": SUBSTATUS_STATUSES.get(item.new_state, previous.status),
+                    "substatus": item.new_state
+                })
+
+            else:
+                continue
+
+            if posting.status in self.statuses:
+                self._put(posting)
+            else:
+                # Сверка не вернет такое отправление, но время обновления защищает его от устаревшего ответа сверки.
+                self._remove(posting.posting_number)
+                self._updated[posting.posting_number] = monotonic()
+
+    def attach(self, push: "OzonPushClient"):
+        """
+        Подписывает индекс на push-уведомления об отправлениях.
+        """
+        async def handler(event: Union[BasePushEvent, List[BasePushEvent]]):
+            self.apply(event)
+
+        push.on("TYPE_NEW_POSTING", "TYPE_POSTING_CANCELLED", "TYPE_STATE_CHANGED")(handler)
+
+    async def reconcile(self, wait: bool = True):
+        """
+        Загружает отправления из API и заменяет ими индекс. Отправления, обновленные push-уведомлениями
+        во время загрузки, сохраняют состояние из уведомления.
+        """
+        started = monotonic()
+        now = datetime.now(timezone.utc)
+
+        responses = await asyncio.gather(*(
+            # Состояние строится из типизированных полей, поэтому модели валидируются независимо от model_mode клиента.
+            self._client.posting.get_unfulfilled_list(
+                status, now - self.lookback, now + self.lookahead, wait=wait, mode="bulk"
+            )
+            for status in self.statuses
+        ))
+
+        fresh = {
+            order.posting_number: self._from_order(order)
+            for response in responses
+            for order in response.orders
+        }
+
+        for posting_number in list(self._postings):
+            if (posting_number not in fresh) and (self._updated[posting_number] < started):
+                self._remove(posting_number)
+
+        for posting_number, posting in fresh.items():
+            if self._updated.get(posting_number, started) <= started:
+                self._put(posting)
+
+        # Отметки отправлений, удаленных уведомлениями, нужны только до конца сверки, начатой до уведомления.
+        for posting_number in [
+            number for number, updated in self._updated.items() if (number not in self._postings) and (updated < started)
+        ]:
+            del self._updated[posting_number]
+
+    seed = reconcile
+
+    async def _reconcile_forever(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reconcile()
+            except Exception:
+                logger.exception("Posting store reconciliation failed")
+
+    async def start(self, interval: float = 600):
+        """
+        Заполняет индекс и запускает периодическую сверку с API.
+
+        :param interval: Период сверки в секундах.
+        """
+        await self.reconcile()
+        self._task = asyncio.create_task(self._reconcile_forever(interval))
+
+    async def stop(self):
+        """
+        Останавливает периодическую сверку.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -84,3 +84,16 @@ Posting_SubStatuses = Literal[
     "posting_not_in_sort_center",
     "sent_by_seller",
 ]
+
+Model_Modes = Literal[
+    "validate",
+    "bulk",
+    "lazy",
+    "compact",
+]
+
+Push_Overflow_Policies = Literal[
+    "wait",
+    "drop",
+    "reject",
+]
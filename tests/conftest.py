@@ -0,0 +1,36 @@
+import asyncio
+from typing import (
+    Any,
+    Dict,
+    Optional
+)
+
+import pytest
+
+from benchmarks.server import MockOzonServer
+from pyozonapi.client import OzonClient
+
+
+class FakeApi:
+    """
+    Замена OzonClient.fetch без HTTP на обработчиках MockOzonServer. delays задает задержку ответа по endpoint.
+    """
+    def __init__(self, delays: Optional[Dict[str, float]] = None, **options: Any):
+        self.server = MockOzonServer(**options)
+        self.delays: Dict[str, float] = delays or {}
+        self.requests: Dict[str, int] = {}
+
+    async def fetch(self, method: str, endpoint: str, wait: bool = False, time: Optional[int] = None,
+                    json: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Dict[str, Any]:
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        await asyncio.sleep(self.delays.get(endpoint, 0))
+        return await self.server.handlers[endpoint](json or {})
+
+
+@pytest.fixture
+def make_client():
+    def make(api: FakeApi, **options: Any) -> OzonClient:
+        client = OzonClient("key", "client", **options)
+        client.fetch = api.fetch
+        return client
+    return make
@@ -0,0 +1,75 @@
+import asyncio
+
+from pyozonapi.cache import fingerprint
+from pyozonapi.models.product import ProductInfoResponse, ProductListResponse
+from pyozonapi.modules import tools
+from tests.conftest import FakeApi
+
+INFO = "v2/product/info/list"
+
+
+def test_response_arguments_are_fingerprinted_by_offer_ids():
+    items = [{"offer_id": f"offer-{index}", "product_id": index} for index in range(10)]
+    bulk = ProductListResponse.from_response(items, "bulk")
+    lazy = ProductListResponse.from_response(items, "lazy")
+
+    key = fingerprint({"product_list": bulk})
+
+    assert fingerprint({"product_list": lazy}) == key
+    assert all(isinstance(item, dict) for item in list.__iter__(lazy.offers))
+    assert fingerprint({"product_list": ProductListResponse.from_response(items, "compact")}) == key
+    assert fingerprint({"product_list": ProductListResponse.from_response(items[:-1], "bulk")}) != key
+
+
+def test_no_fingerprint_without_ttl(make_client, monkeypatch):
+    monkeypatch.setattr(tools, "fingerprint", lambda arguments: (_ for _ in ()).throw(AssertionError("fingerprint")))
+    api = FakeApi(delays={INFO: 0.01}, products=1500)
+    client = make_client(api)
+
+    async def run():
+        product_list = await client.product.get_list()
+        first, second = await asyncio.gather(client.product.get_info(product_list), client.product.get_info(product_list))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert api.requests[INFO] == 2
+
+
+def test_ttl_cache_hits_for_equal_lists(make_client):
+    api = FakeApi(products=1500)
+    client = make_client(api, ttl=60)
+
+    async def run():
+        for _ in range(3):
+            product_list = await client.product.get_list()
+            info = await client.product.get_info(product_list)
+        return info
+
+    info = asyncio.run(run())
+
+    assert isinstance(info, ProductInfoResponse)
+    assert api.requests[INFO] == 2
+
+
+def test_ttl_cache_key_includes_client_model_mode(make_client):
+    from pyozonapi.cache import MemoryCache
+    from pyozonapi.models.base import CompactRecord
+
+    api = FakeApi(products=1500)
+    cache = MemoryCache()
+    results = {}
+
+    async def run(mode):
+        client = make_client(api, ttl=60, cache=cache, model_mode=mode)
+        product_list = await client.product.get_list()
+        return await client.product.get_info(product_list)
+
+    for mode in ("bulk", "compact", "bulk"):
+        results[mode] = asyncio.run(run(mode))
+
+    assert isinstance(results["compact"].offers[0], CompactRecord)
+    assert not isinstance(results["bulk"].offers[0], CompactRecord)
+    assert api.requests[INFO] == 4
+    assert api.requests["v2/product/list"] == 4
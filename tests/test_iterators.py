@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from pyozonapi.models.base import CompactRecord
+from tests.conftest import FakeApi
+
+CUTOFF_FROM = datetime.now(timezone.utc) - timedelta(days=30)
+CUTOFF_TO = datetime.now(timezone.utc) + timedelta(days=30)
+
+
+def _iterators(client, mode):
+    return {
+        "product": client.product.iter_list(mode=mode),
+        "stocks": client.stocks.iter_stocks(mode=mode),
+        "posting": client.posting.iter_unfulfilled_list("awaiting_packaging", CUTOFF_FROM, CUTOFF_TO, mode=mode),
+    }
+
+
+@pytest.mark.parametrize("mode", [None, "compact"])
+def test_iterators_accept_mode(make_client, mode):
+    client = make_client(FakeApi(products=1500, postings=1200))
+
+    async def run():
+        return {name: [item async for item in iterator] for name, iterator in _iterators(client, mode).items()}
+
+    items = asyncio.run(run())
+
+    assert len(items["product"]) == 1500
+    assert len(items["stocks"]) == 1500
+    assert len(items["posting"]) == 1200
+    for values in items.values():
+        assert all(isinstance(item, CompactRecord) == (mode == "compact") for item in values)
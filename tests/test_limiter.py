@@ -0,0 +1,59 @@
+import asyncio
+from time import monotonic
+
+from pyozonapi.limiter import FairScheduler, RateLimiter
+
+ENDPOINT = "v2/product/info/list"
+
+
+async def _starts_after_release(limiter: RateLimiter) -> list:
+    starts = []
+    released = {}
+
+    async def request(hold: float):
+        async with limiter.slot(ENDPOINT):
+            starts.append(monotonic())
+            await asyncio.sleep(hold)
+        released.setdefault("at", monotonic())
+
+    long = [asyncio.create_task(request(0.2)) for _ in range(4)]
+    await asyncio.sleep(0)
+    await asyncio.gather(*long, *(request(0.0) for _ in range(8)))
+    return [start - released["at"] for start in starts[4:]]
+
+
+def test_tokens_are_taken_after_a_concurrency_slot():
+    # 4 токена, пополнение 40 в секунду. Пока 4 долгих запроса занимают все места, ожидающие не должны
+    # накопить токены и отправить 8 запросов разом после освобождения мест.
+    limiter = RateLimiter({ENDPOINT: (4, 0.1)}, max_concurrency=4)
+
+    starts = asyncio.run(_starts_after_release(limiter))
+
+    assert sum(1 for start in starts if start < 0.015) <= 5
+
+
+def test_tokens_are_taken_after_a_scheduler_slot():
+    limiter = RateLimiter({ENDPOINT: (4, 0.1)}, max_concurrency=10, scheduler=FairScheduler(4), account="a")
+
+    starts = asyncio.run(_starts_after_release(limiter))
+
+    assert sum(1 for start in starts if start < 0.015) <= 5
+
+
+def test_fair_scheduler_alternates_accounts():
+    async def run():
+        scheduler = FairScheduler(1)
+        order = []
+
+        async def request(account: str):
+            async with scheduler.slot(account):
+                order.append(account)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(request("a") for _ in range(4)), *(request("b") for _ in range(2)))
+        return order
+
+    order = asyncio.run(run())
+
+    # Первый запрос занимает свободное место сразу, дальше места выдаются аккаунтам по очереди.
+    assert order == ["a", "a", "b", "a", "b", "a"]
@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from tests.conftest import FakeApi
+
+FBS = "v1/product/info/stocks-by-warehouse/fbs"
+
+
+@pytest.mark.parametrize("products, concurrency, buffer", [(12000, 4, 1), (30000, None, 4)])
+def test_stocks_fbs_keeps_every_batch_when_fbs_is_slow(make_client, products, concurrency, buffer):
+    api = FakeApi(delays={FBS: 0.01}, products=products, warehouses=2)
+    client = make_client(api)
+
+    response = asyncio.run(client.sync.stocks_fbs(concurrency=concurrency, buffer=buffer))
+
+    assert len(response.products.offers) == products
+    assert len(response.stocks.offers) == products * 2
+    assert len({(offer.sku, offer.warehouse_id) for offer in response.stocks.offers}) == products * 2
+    assert api.requests[FBS] == products // 500
+
+
+def test_stocks_fbs_matches_serial_calls(make_client):
+    api = FakeApi(products=2500)
+    client = make_client(api)
+
+    async def run():
+        info = await client.product.get_info(await client.product.get_list())
+        return info, await client.stocks.get_fbs(info), await client.sync.stocks_fbs()
+
+    info, stocks, synced = asyncio.run(run())
+
+    assert [offer.id for offer in synced.products.offers] == [offer.id for offer in info.offers]
+    assert sorted(synced.stocks.by_offer_warehouse) == sorted(stocks.by_offer_warehouse)